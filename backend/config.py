@@ -81,6 +81,9 @@ class Settings(BaseSettings):
     voice_gender: str = Field(default="female", alias="VOICE_GENDER")  # 'male' or 'female'
     emotion_level: str = Field(default="medium", alias="EMOTION_LEVEL") # 'low', 'medium', 'high'
 
+    # LLM context: older turns are summarized once the history passes this many (estimated) tokens
+    max_history_tokens: int = Field(default=3000, alias="MAX_HISTORY_TOKENS")
+
     # PersonaPlex (NVIDIA full-duplex conversational AI)
     personaplex_enabled: bool = Field(default=False, alias="PERSONAPLEX_ENABLED")
     personaplex_api_key: Optional[str] = Field(default=None, alias="PERSONAPLEX_API_KEY")
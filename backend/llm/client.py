@@ -3,10 +3,12 @@ MedVoice AI - LLM Client
 Groq client for ultra-fast inference with Llama models.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, AsyncIterator
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
+import httpx
 from openai import AsyncOpenAI
 
 from .prompts import SystemPrompts
@@ -14,6 +16,53 @@ from .function_calls import BOOKING_TOOLS
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cap on in-flight LLM requests, so call bursts queue here
+# instead of piling onto the provider. Held for a request and the reading
+# of its stream only, never while a consumer speaks the output.
+_LLM_SEM = asyncio.Semaphore(32)
+
+# Marks the end of a stream read by LLMClient._read_stream
+_STREAM_END = object()
+
+# Process-wide HTTP client shared by every LLMClient (one pool, kept-alive TLS)
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get or create the pooled HTTP/2 client used for LLM requests."""
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=256,
+                max_keepalive_connections=64,
+                keepalive_expiry=60
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+    return _shared_http_client
+
+
+def has_idle_connection() -> bool:
+    """True if the shared pool already holds an open connection that can take a request."""
+    client = _shared_http_client
+    if client is None or client.is_closed:
+        return False
+    pool = getattr(client._transport, "_pool", None)
+    return any(
+        conn.is_available() and not conn.has_expired()
+        for conn in getattr(pool, "connections", ())
+    )
+
+
+async def close_shared_http_client():
+    """Close the pooled HTTP client (application shutdown)."""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
 
 class LLMClient:
     """
@@ -28,18 +77,29 @@ class LLMClient:
         self,
         api_key: str,
         primary_model: str = "meta-llama/llama-4-maverick-17b-128e-instruct",
-        fallback_model: str = "meta-llama/llama-guard-4-12b"
+        fallback_model: str = "meta-llama/llama-guard-4-12b",
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         self.api_key = api_key
         self.primary_model = primary_model
         self.fallback_model = fallback_model
 
         # Initialize OpenAI client configured for Groq
+        # (pass get_shared_http_client() to reuse pooled connections across calls)
         self.client = AsyncOpenAI(
             api_key=api_key,
-            base_url=self.GROQ_BASE_URL
+            base_url=self.GROQ_BASE_URL,
+            http_client=http_client
         )
 
+    async def prewarm(self):
+        """Open a pooled connection to the API (TCP + TLS) ahead of the first real request."""
+        try:
+            await self.client.models.list()
+            logger.debug("LLM connection prewarmed")
+        except Exception as e:
+            logger.warning(f"LLM prewarm failed: {e}")
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -72,17 +132,22 @@ class LLMClient:
                 "temperature": 0.7,
                 "stream": stream
             }
+            if stream:
+                # Ask for token usage on the final chunk (see stream_usage); sent as a raw
+                # body field because the pinned SDK has no stream_options argument
+                request_params["extra_body"] = {"stream_options": {"include_usage": True}}
             
             # Add tools if enabled
             if use_tools:
                 request_params["tools"] = BOOKING_TOOLS
                 request_params["tool_choice"] = "auto"
 
-            # Make request
-            response = await self.client.chat.completions.create(**request_params)
-            
+            # Make request (streams are capped by the caller for as long as they are read)
             if stream:
-                return response
+                return await self.client.chat.completions.create(**request_params)
+
+            async with _LLM_SEM:
+                response = await self.client.chat.completions.create(**request_params)
             
             # Non-streaming handling
             choice = response.choices[0]
@@ -93,10 +158,7 @@ class LLMClient:
                 "tool_calls": None,
                 "model": model,
                 "finish_reason": choice.finish_reason,
-                "usage": {
-                    "input_tokens": response.usage.prompt_tokens,
-                    "output_tokens": response.usage.completion_tokens
-                } if response.usage else None
+                "usage": self._usage_dict(response.usage)
             }
             
             if message.tool_calls:
@@ -143,11 +205,63 @@ class LLMClient:
                 "error": str(e)
             }
 
+    @staticmethod
+    def _field(obj: Any, name: str) -> Any:
+        """Read a response field that may be a model attribute or (SDK extra) a plain dict key."""
+        if isinstance(obj, dict):
+            return obj.get(name)
+        return getattr(obj, name, None)
+
+    @classmethod
+    def _cached_prompt_tokens(cls, usage: Any) -> int:
+        """Prompt tokens served from the provider's prefix cache (0 if not reported)."""
+        details = cls._field(usage, "prompt_tokens_details")
+        return cls._field(details, "cached_tokens") or 0
+
+    @classmethod
+    def _usage_dict(cls, usage: Any) -> Optional[Dict[str, int]]:
+        """Normalize a completion usage object to input/output/cached token counts."""
+        if not usage:
+            return None
+        return {
+            "input_tokens": cls._field(usage, "prompt_tokens") or 0,
+            "output_tokens": cls._field(usage, "completion_tokens") or 0,
+            "cached_input_tokens": cls._cached_prompt_tokens(usage)
+        }
+
+    @classmethod
+    def stream_usage(cls, chunk: Any) -> Optional[Dict[str, int]]:
+        """
+        Token usage from a streamed chunk, else None.
+        OpenAI-style streams put it in `usage` on the final chunk; Groq also
+        reports it under `x_groq.usage`. Older SDKs keep both as plain dicts.
+        """
+        usage = cls._field(chunk, "usage") or cls._field(cls._field(chunk, "x_groq"), "usage")
+        return cls._usage_dict(usage)
+
+    @staticmethod
+    def _build_messages(
+        conversation_history: List[Dict[str, str]],
+        system_prompt: str,
+        dynamic_context: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Assemble request messages: static first, dynamic last.
+        The system prompt and history form a stable prefix that providers
+        can cache; volatile context (current time) goes after it.
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend(conversation_history)
+        if dynamic_context:
+            messages.append({"role": "system", "content": dynamic_context})
+        return messages
+
     async def get_response_streaming(
         self,
         conversation_history: List[Dict[str, str]],
         system_prompt: str,
-        language: str = "fr"
+        language: str = "fr",
+        dynamic_context: Optional[str] = None
     ) -> AsyncIterator[str]:
         """
         Get a conversational response with streaming for lower latency.
@@ -156,33 +270,47 @@ class LLMClient:
             conversation_history: List of message dicts
             system_prompt: System prompt to use
             language: Current language
+            dynamic_context: Volatile context appended after the history
 
         Yields:
             String tokens as they arrive
         """
-        # Build messages with system prompt
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(conversation_history)
+        messages = self._build_messages(conversation_history, system_prompt, dynamic_context)
 
-        # Stream response
-        # Stream response
-        stream_response = await self.chat(messages, language=language, stream=True)
-        
-        # Check if it's a generator (from fallback/error handling) or OpenAI response
-        if hasattr(stream_response, '__aiter__'):
-            async for chunk in stream_response:
+        # A reader task holds the request slot while it drains the stream, so a
+        # consumer that pauses between chunks (TTS) doesn't keep the slot busy
+        chunks: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read_stream(messages, language, chunks))
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _STREAM_END:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
                 yield chunk
-        else:
-            # OpenAI Stream object
-            async for chunk in stream_response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+        finally:
+            reader.cancel()
+
+    async def _read_stream(self, messages: List[Dict[str, Any]], language: str, chunks: asyncio.Queue):
+        """Run a streaming request under the request cap, queueing every chunk (then _STREAM_END)."""
+        try:
+            async with _LLM_SEM:
+                stream_response = await self.chat(messages, language=language, stream=True)
+                # OpenAI stream, or a generator from fallback/error handling
+                async for chunk in stream_response:
+                    chunks.put_nowait(chunk)
+        except Exception as e:
+            chunks.put_nowait(e)
+        finally:
+            chunks.put_nowait(_STREAM_END)
 
     async def get_response(
         self,
         conversation_history: List[Dict[str, str]],
         system_prompt: str,
-        language: str = "fr"
+        language: str = "fr",
+        dynamic_context: Optional[str] = None
     ) -> str:
         """
         Get a conversational response.
@@ -191,13 +319,12 @@ class LLMClient:
             conversation_history: List of message dicts
             system_prompt: System prompt to use
             language: Current language
+            dynamic_context: Volatile context appended after the history
 
         Returns:
             Assistant response text
         """
-        # Build messages with system prompt
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(conversation_history)
+        messages = self._build_messages(conversation_history, system_prompt, dynamic_context)
 
         # Get response
         result = await self.chat(messages, language=language)
@@ -211,6 +338,39 @@ class LLMClient:
 
         return result
 
+    async def summarize(
+        self,
+        conversation_history: List[Dict[str, Any]],
+        language: str = "fr"
+    ) -> Optional[str]:
+        """
+        Summarize part of a conversation (used to compact long call histories).
+
+        Args:
+            conversation_history: Messages to summarize
+            language: Current language
+
+        Returns:
+            Summary text, or None if the request failed
+        """
+        speakers = {"user": "Caller", "assistant": "Assistant", "tool": "Tool result", "system": "Note"}
+        lines = [
+            f"{speakers.get(msg.get('role'), 'Note')}: {msg['content']}"
+            for msg in conversation_history
+            if msg.get("content")
+        ]
+        if not lines:
+            return None
+
+        messages = [
+            {"role": "system", "content": SystemPrompts.get_summary_prompt(language)},
+            {"role": "user", "content": "\n".join(lines)}
+        ]
+        result = await self.chat(messages, language=language, use_tools=False)
+        if result.get("error") or not result.get("content"):
+            return None
+        return result["content"].strip()
+
     def _get_error_message(self, language: str) -> str:
         """Get error message in the appropriate language - warm and apologetic."""
         if language == "fr":
@@ -219,6 +379,25 @@ class LLMClient:
             return "Oops, sorry! I had a little hiccup there. Could you say that again for me?"
 
 
+# Process-wide LLMClient per (api_key, primary_model, fallback_model)
+_shared_llm_clients: Dict[Tuple[str, str, str], LLMClient] = {}
+
+
+def get_llm_client(api_key: str, primary_model: str, fallback_model: str) -> LLMClient:
+    """Get or create the LLM client shared by every call with this configuration."""
+    key = (api_key, primary_model, fallback_model)
+    client = _shared_llm_clients.get(key)
+    if client is None or client.client.is_closed():
+        client = LLMClient(
+            api_key=api_key,
+            primary_model=primary_model,
+            fallback_model=fallback_model,
+            http_client=get_shared_http_client()
+        )
+        _shared_llm_clients[key] = client
+    return client
+
+
 class ConversationContext:
     """Manages conversation context and history."""
 
@@ -3,10 +3,12 @@ MedVoice AI - Function Calling Tools
 Tool definitions for appointment booking and management.
 """
 
-from typing import List, Dict, Any
+import hashlib
+import json
+from typing import List, Dict, Any, Tuple
 
 # Tool definitions for OpenAI-compatible function calling
-BOOKING_TOOLS: List[Dict[str, Any]] = [
+_TOOL_DEFINITIONS: List[Dict[str, Any]] = [
     {
         "type": "function",
         "function": {
@@ -184,6 +186,17 @@ BOOKING_TOOLS: List[Dict[str, Any]] = [
     }
 ]
 
+# Sorted by name and frozen at import: the tools are part of the request
+# prefix, so their order must never change between requests or processes
+BOOKING_TOOLS: Tuple[Dict[str, Any], ...] = tuple(
+    sorted(_TOOL_DEFINITIONS, key=lambda tool: tool["function"]["name"])
+)
+
+# Short hash of the serialized tools, logged with the prompt prefix to spot cache-busting changes
+TOOLS_FINGERPRINT = hashlib.sha256(
+    json.dumps(BOOKING_TOOLS, sort_keys=True, ensure_ascii=False).encode("utf-8")
+).hexdigest()[:12]
+
 
 # Helper function to format slots for speech
 def format_slots_for_speech(slots: List[Dict], language: str = "fr") -> str:
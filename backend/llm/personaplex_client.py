@@ -242,10 +242,14 @@ class WebSocketTransport(PersonaPlexTransport):
         """Yield events from the event queue."""
         while self._connected:
             try:
-                event = await asyncio.wait_for(
-                    self._event_queue.get(),
-                    timeout=0.1
-                )
+                # Drain a burst without a timed wait per event; only block when the queue is empty
+                try:
+                    event = self._event_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    event = await asyncio.wait_for(
+                        self._event_queue.get(),
+                        timeout=0.1
+                    )
                 yield event
             except asyncio.TimeoutError:
                 continue
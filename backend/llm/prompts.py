@@ -143,6 +143,16 @@ IMPORTANT: Use these dates when the patient says "tomorrow", "next week", etc.
 
 """
 
+    @classmethod
+    def get_datetime_context(cls, language: str = "fr",
+                             current_time: Optional[datetime] = None) -> str:
+        """
+        Get the current datetime context block on its own.
+        Sent after the conversation history so the system prompt prefix
+        stays byte-identical between turns (provider prompt caching).
+        """
+        return cls._format_datetime_context(current_time or datetime.now(), language)
+
     @classmethod
     def get_prompt(cls, language: str = "fr", emotion_level: str = "medium",
                    current_time: Optional[datetime] = None) -> str:
@@ -235,6 +245,22 @@ IMPORTANT: Use these dates when the patient says "tomorrow", "next week", etc.
         else:
             return "This sounds like a medical emergency. Please hang up immediately and call 911. I repeat, call 911 now."
 
+    @classmethod
+    def get_summary_prompt(cls, language: str = "fr") -> str:
+        """Get the instruction used to compact earlier call history."""
+        if language == "fr":
+            return (
+                "Résume cette partie de l'appel en quelques phrases pour la réceptionniste. "
+                "Garde les faits utiles: motif de l'appel, type de visite, dates et heures proposées ou choisies, "
+                "nom et téléphone du patient, numéros de confirmation, questions en suspens. N'invente rien."
+            )
+        else:
+            return (
+                "Summarize this part of the call in a few sentences for the receptionist. "
+                "Keep the useful facts: reason for calling, visit type, dates and times offered or chosen, "
+                "patient name and phone, confirmation numbers, open questions. Do not invent anything."
+            )
+
     @classmethod
     def get_goodbye_message(cls, language: str = "fr") -> str:
         """Get the goodbye message."""
@@ -3,6 +3,7 @@ MedVoice AI - Main FastAPI Application
 Bilingual AI Phone Receptionist for Quebec Medical Clinics
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Response
@@ -11,7 +12,12 @@ from fastapi.responses import JSONResponse
 import uvicorn
 
 from config import get_settings
+from llm.client import close_shared_http_client, get_llm_client
+from storage.firebase_client import get_firebase_client
+from storage.transcript_writer import get_transcript_writer, close_transcript_writer
 from voice.twilio_handler import TwilioMediaStreamHandler
+from voice.tts_client import GoogleTTSClient
+from voice.conversation import ConversationManager
 from api.admin import router as admin_router
 from api.webhooks import router as webhooks_router
 
@@ -34,10 +40,36 @@ async def lifespan(app: FastAPI):
     logger.info(f"Default language: {settings.default_language}")
     logger.info(f"Clinic: {settings.clinic_name}")
 
+    # Background Firestore writer for end-of-call transcripts
+    get_transcript_writer(get_firebase_client(settings.firebase_project_id)).start()
+
+    # Build the TTS client pool, then render the greeting and filler phrases once
+    # so calls play them without a TTS round-trip
+    prerender_task = None
+    try:
+        await asyncio.to_thread(GoogleTTSClient.fill_client_pool)
+        tts_client = GoogleTTSClient(voice_gender=settings.voice_gender)
+        prerender_task = asyncio.create_task(tts_client.prerender(ConversationManager.fixed_phrases()))
+    except Exception as e:
+        logger.warning(f"TTS warm-up skipped: {e}")
+
+    # Open the pooled LLM connection once; calls reuse it through the shared HTTP client
+    llm_client = get_llm_client(
+        api_key=settings.groq_api_key,
+        primary_model=settings.groq_model_primary,
+        fallback_model=settings.groq_model_fallback
+    )
+    prewarm_task = asyncio.create_task(llm_client.prewarm())
+
     yield
 
     # Shutdown
     logger.info("👋 MedVoice AI shutting down...")
+    if prerender_task is not None:
+        prerender_task.cancel()
+    prewarm_task.cancel()
+    await close_transcript_writer()
+    await close_shared_http_client()
 
 
 # Create FastAPI app
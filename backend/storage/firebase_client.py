@@ -3,9 +3,11 @@ MedVoice AI - Firebase Client
 Handles Firestore operations for call data and transcripts.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import firestore
 from google.cloud.firestore_v1 import FieldFilter
 
@@ -18,6 +20,9 @@ class FirebaseClient:
     Manages call records, transcripts, and stats.
     """
 
+    # Firestore rejects batches with more than 500 writes
+    MAX_BATCH_WRITES = 500
+
     def __init__(self, project_id: Optional[str] = None):
         """Initialize Firestore client."""
         try:
@@ -52,11 +57,21 @@ class FirebaseClient:
 
         try:
             call_ref = self.db.collection("calls").document(call_data.get("call_sid"))
-            call_ref.set({
+            record = {
                 **call_data,
                 "created_at": firestore.SERVER_TIMESTAMP,
                 "status": "active"
-            })
+            }
+            try:
+                await asyncio.to_thread(call_ref.create, record)
+            except AlreadyExists:
+                # Finalization wrote the record first: only fill in the fields it
+                # doesn't have, so its status and summary are never overwritten
+                doc = await asyncio.to_thread(call_ref.get)
+                existing = doc.to_dict() or {}
+                missing = {key: value for key, value in record.items() if key not in existing}
+                if missing:
+                    await asyncio.to_thread(call_ref.set, missing, merge=True)
             logger.info(f"Call created: {call_data.get('call_sid')}")
             return call_data.get("call_sid", "")
         except Exception as e:
@@ -70,7 +85,7 @@ class FirebaseClient:
 
         try:
             call_ref = self.db.collection("calls").document(call_sid)
-            call_ref.update({
+            await asyncio.to_thread(call_ref.update, {
                 **updates,
                 "updated_at": firestore.SERVER_TIMESTAMP
             })
@@ -95,7 +110,7 @@ class FirebaseClient:
             # Use provided status or default to "completed"
             status = summary.get("status", "completed")
 
-            call_ref.update({
+            await asyncio.to_thread(call_ref.update, {
                 "status": status,
                 "ended_at": firestore.SERVER_TIMESTAMP,
                 **summary
@@ -111,7 +126,7 @@ class FirebaseClient:
 
         try:
             call_ref = self.db.collection("calls").document(call_sid)
-            doc = call_ref.get()
+            doc = await asyncio.to_thread(call_ref.get)
             if doc.exists:
                 return {"call_id": doc.id, **doc.to_dict()}
             return None
@@ -132,7 +147,7 @@ class FirebaseClient:
                 .offset(offset)
             )
 
-            docs = query.stream()
+            docs = await asyncio.to_thread(lambda: list(query.stream()))
             calls = []
             for doc in docs:
                 data = doc.to_dict()
@@ -166,7 +181,7 @@ class FirebaseClient:
                 .where(filter=FieldFilter("status", "==", "active"))
             )
 
-            docs = query.stream()
+            docs = await asyncio.to_thread(lambda: list(query.stream()))
             return [{"call_id": doc.id, **doc.to_dict()} for doc in docs]
         except Exception as e:
             logger.error(f"Error getting active calls: {e}")
@@ -190,11 +205,86 @@ class FirebaseClient:
                 doc_ref = transcript_ref.document(f"{i:04d}")
                 batch.set(doc_ref, entry)
 
-            batch.commit()
+            await asyncio.to_thread(batch.commit)
             logger.info(f"Transcript saved for call: {call_sid}")
         except Exception as e:
             logger.error(f"Error saving transcript: {e}")
 
+    def transcript_collection(self, call_sid: str):
+        """Get the transcript subcollection reference for a call (None if not connected)."""
+        if not self.db:
+            return None
+        return self.db.collection("calls").document(call_sid).collection("transcript")
+
+    async def save_transcript_entries(self, transcript_ref, entries: List[Tuple[str, Dict[str, Any]]]):
+        """
+        Write live transcript entries for a call in one batch commit.
+
+        Args:
+            transcript_ref: The call's transcript collection (see transcript_collection)
+            entries: (document id, entry) pairs, at most MAX_BATCH_WRITES
+        """
+        if not self.db or transcript_ref is None or not entries:
+            return
+
+        try:
+            batch = self.db.batch()
+            for doc_id, entry in entries:
+                batch.set(transcript_ref.document(doc_id), entry)
+            await asyncio.to_thread(batch.commit)
+        except Exception as e:
+            logger.error(f"Error saving transcript entries: {e}")
+
+    async def finalize_calls(self, finalizations: Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]]):
+        """
+        End several calls and save their transcripts, committing each call separately.
+
+        Calls are written concurrently but never share a batch, so one failed
+        call (e.g. a rejected commit) doesn't lose the other calls' transcripts.
+
+        Args:
+            finalizations: call_sid -> (end-of-call summary, transcript entries)
+        """
+        if not self.db:
+            return
+
+        results = await asyncio.gather(*(
+            self._finalize_call(call_sid, summary, transcript)
+            for call_sid, (summary, transcript) in finalizations.items()
+        ))
+        finalized = [call_sid for call_sid, ok in zip(finalizations, results) if ok]
+        logger.info(f"Finalized {len(finalized)}/{len(finalizations)} call(s): {', '.join(finalized)}")
+
+    async def _finalize_call(self, call_sid: str, summary: Dict[str, Any], transcript: List[Dict[str, Any]]) -> bool:
+        """End one call and save its transcript. Returns False if any commit failed."""
+        try:
+            call_ref = self.db.collection("calls").document(call_sid)
+            transcript_ref = call_ref.collection("transcript")
+
+            # merge=True: the call record is fire-and-forget and may be missing
+            writes = [("call", call_ref, {
+                "status": summary.get("status", "completed"),
+                "ended_at": firestore.SERVER_TIMESTAMP,
+                **summary
+            })]
+            writes.extend(
+                ("entry", transcript_ref.document(f"{i:04d}"), entry)
+                for i, entry in enumerate(transcript)
+            )
+
+            for start in range(0, len(writes), self.MAX_BATCH_WRITES):
+                batch = self.db.batch()
+                for kind, doc_ref, data in writes[start:start + self.MAX_BATCH_WRITES]:
+                    if kind == "call":
+                        batch.set(doc_ref, data, merge=True)
+                    else:
+                        batch.set(doc_ref, data)
+                await asyncio.to_thread(batch.commit)
+            return True
+        except Exception as e:
+            logger.error(f"Error finalizing call {call_sid}: {e}")
+            return False
+
     async def get_transcript(self, call_sid: str) -> List[Dict[str, Any]]:
         """Get the transcript for a call."""
         if not self.db:
@@ -208,7 +298,7 @@ class FirebaseClient:
                 .order_by("timestamp")
             )
 
-            docs = transcript_ref.stream()
+            docs = await asyncio.to_thread(lambda: list(transcript_ref.stream()))
             return [doc.to_dict() for doc in docs]
         except Exception as e:
             logger.error(f"Error getting transcript: {e}")
@@ -239,7 +329,7 @@ class FirebaseClient:
                 .where(filter=FieldFilter("created_at", ">=", today_start))
             )
 
-            today_calls = list(today_query.stream())
+            today_calls = await asyncio.to_thread(lambda: list(today_query.stream()))
 
             # Calculate stats
             total_calls = len(today_calls)
@@ -298,7 +388,7 @@ class FirebaseClient:
                 booking_id = str(uuid.uuid4())[:8]
 
             appt_ref = self.db.collection("appointments").document(booking_id)
-            appt_ref.set({
+            await asyncio.to_thread(appt_ref.set, {
                 **booking_data,
                 "booking_id": booking_id,
                 "created_at": firestore.SERVER_TIMESTAMP,
@@ -344,7 +434,7 @@ class FirebaseClient:
             if status:
                 query = query.where(filter=FieldFilter("status", "==", status))
 
-            docs = query.stream()
+            docs = await asyncio.to_thread(lambda: list(query.stream()))
             appointments = []
             for doc in docs:
                 data = doc.to_dict()
@@ -367,7 +457,7 @@ class FirebaseClient:
 
         try:
             appt_ref = self.db.collection("appointments").document(booking_id)
-            doc = appt_ref.get()
+            doc = await asyncio.to_thread(appt_ref.get)
             if doc.exists:
                 return {"booking_id": doc.id, **doc.to_dict()}
             return None
@@ -382,7 +472,7 @@ class FirebaseClient:
 
         try:
             appt_ref = self.db.collection("appointments").document(booking_id)
-            appt_ref.update({
+            await asyncio.to_thread(appt_ref.update, {
                 **updates,
                 "updated_at": firestore.SERVER_TIMESTAMP
             })
@@ -397,7 +487,7 @@ class FirebaseClient:
 
         try:
             appt_ref = self.db.collection("appointments").document(booking_id)
-            appt_ref.update({
+            await asyncio.to_thread(appt_ref.update, {
                 "status": "cancelled",
                 "cancelled_at": firestore.SERVER_TIMESTAMP,
                 "cancellation_reason": reason
@@ -438,7 +528,7 @@ class FirebaseClient:
 
         try:
             settings_ref = self.db.collection("settings").document(settings_key)
-            doc = settings_ref.get()
+            doc = await asyncio.to_thread(settings_ref.get)
             if doc.exists:
                 return {**default_settings, **doc.to_dict()}
             return default_settings
@@ -463,7 +553,7 @@ class FirebaseClient:
 
         try:
             settings_ref = self.db.collection("settings").document(settings_key)
-            settings_ref.set({
+            await asyncio.to_thread(settings_ref.set, {
                 **updates,
                 "updated_at": firestore.SERVER_TIMESTAMP
             }, merge=True)
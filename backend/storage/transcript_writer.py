@@ -0,0 +1,108 @@
+"""
+MedVoice AI - Transcript Writer
+Background worker that finalizes ended calls in Firestore off the call-teardown path.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .firebase_client import FirebaseClient
+
+logger = logging.getLogger(__name__)
+
+Finalization = Tuple[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class TranscriptWriter:
+    """
+    Queues end-of-call writes and flushes them in batches.
+
+    save_transcript() only enqueues; a single consumer task collects up to
+    max_batch finalizations (or whatever arrives within flush_interval),
+    keeps the latest one per call SID and writes them with
+    FirebaseClient.finalize_calls.
+    """
+
+    def __init__(
+        self,
+        firebase: FirebaseClient,
+        max_batch: int = 25,
+        flush_interval: float = 0.1,
+        max_queue: int = 1000
+    ):
+        self.firebase = firebase
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: "asyncio.Queue[Tuple[str, Finalization]]" = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the consumer task (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("📝 Transcript writer started")
+
+    async def enqueue(self, call_sid: str, summary: Dict[str, Any], transcript: List[Dict[str, Any]]):
+        """Queue a call's end-of-call summary and transcript for writing."""
+        self.start()
+        await self._queue.put((call_sid, (summary, transcript)))
+
+    async def stop(self):
+        """Flush everything still queued, then stop the consumer."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        """Consume the queue, one batch per flush window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            call_sid, finalization = await self._queue.get()
+            pending: Dict[str, Finalization] = {call_sid: finalization}
+            received = 1
+
+            # Collect more writes until the batch is full or the window closes
+            deadline = loop.time() + self.flush_interval
+            while received < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    call_sid, finalization = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending[call_sid] = finalization  # latest write per call wins
+                received += 1
+
+            try:
+                await self.firebase.finalize_calls(pending)
+            except Exception as e:
+                logger.error(f"Transcript writer error: {e}")
+            finally:
+                for _ in range(received):
+                    self._queue.task_done()
+
+
+# Singleton instance
+_transcript_writer: Optional[TranscriptWriter] = None
+
+
+def get_transcript_writer(firebase: FirebaseClient) -> TranscriptWriter:
+    """Get or create the transcript writer singleton."""
+    global _transcript_writer
+    if _transcript_writer is None:
+        _transcript_writer = TranscriptWriter(firebase)
+    return _transcript_writer
+
+
+async def close_transcript_writer():
+    """Flush pending writes and stop the writer (application shutdown)."""
+    if _transcript_writer is not None:
+        await _transcript_writer.stop()
@@ -0,0 +1,118 @@
+"""Tests for call creation and end-of-call finalization in FirebaseClient."""
+
+import asyncio
+
+from google.api_core.exceptions import AlreadyExists
+
+from storage.firebase_client import FirebaseClient
+
+
+class FakeDocument:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def collection(self, name):
+        return FakeCollection(self.db, f"{self.path}/{name}")
+
+    def create(self, data):
+        if self.path in self.db.docs:
+            raise AlreadyExists(self.path)
+        self.db.docs[self.path] = dict(data)
+
+    def get(self):
+        data = self.db.docs.get(self.path)
+        return type("Snapshot", (), {"to_dict": lambda _: dict(data) if data else None})()
+
+    def set(self, data, merge=False):
+        self.db.docs[self.path] = {**self.db.docs.get(self.path, {}), **data} if merge else dict(data)
+
+
+class FakeCollection:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def document(self, doc_id):
+        return FakeDocument(self.db, f"{self.path}/{doc_id}")
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, doc_ref, data, merge=False):
+        self.writes.append((doc_ref, data, merge))
+
+    def commit(self):
+        # Firestore commits are atomic: one bad write rejects the whole batch
+        paths = [doc_ref.path for doc_ref, _, _ in self.writes]
+        if any(path.startswith(f"calls/{sid}") for sid in self.db.failing for path in paths):
+            raise RuntimeError("404 NOT_FOUND")
+        for doc_ref, data, merge in self.writes:
+            doc_ref.set(data, merge=merge)
+        self.db.committed.extend(paths)
+
+
+class FakeDB:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.committed = []
+        self.docs = {}
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+def _client(db):
+    client = FirebaseClient.__new__(FirebaseClient)
+    client.db = db
+    return client
+
+
+def test_one_failed_call_does_not_drop_the_others():
+    db = FakeDB(failing={"CA2"})
+    entry = {"speaker": "caller", "text": "Bonjour"}
+    finalizations = {
+        sid: ({"duration_seconds": 30}, [entry, entry])
+        for sid in ("CA1", "CA2", "CA3")
+    }
+
+    asyncio.run(_client(db).finalize_calls(finalizations))
+
+    for sid in ("CA1", "CA3"):
+        assert f"calls/{sid}" in db.committed
+        assert f"calls/{sid}/transcript/0000" in db.committed
+        assert f"calls/{sid}/transcript/0001" in db.committed
+    assert not any(path.startswith("calls/CA2") for path in db.committed)
+
+
+def test_long_transcript_is_split_into_batches():
+    db = FakeDB()
+    transcript = [{"speaker": "caller", "text": str(i)} for i in range(FirebaseClient.MAX_BATCH_WRITES + 10)]
+
+    asyncio.run(_client(db).finalize_calls({"CA1": ({}, transcript)}))
+
+    assert len(db.committed) == len(transcript) + 1
+
+
+def test_late_call_creation_keeps_the_finalized_record():
+    db = FakeDB()
+    client = _client(db)
+
+    asyncio.run(client.finalize_calls({"CA1": ({"status": "transferred", "language": "en"}, [])}))
+    asyncio.run(client.create_call({
+        "call_sid": "CA1",
+        "caller_number": "+15145550100",
+        "language": "fr",
+        "status": "active"
+    }))
+
+    record = db.docs["calls/CA1"]
+    assert record["status"] == "transferred"
+    assert record["language"] == "en"
+    assert record["caller_number"] == "+15145550100"
@@ -0,0 +1,77 @@
+"""Tests for LLMClient streaming against a mocked HTTP transport."""
+
+import asyncio
+import json
+
+import httpx
+
+from llm.client import LLMClient
+
+
+def _sse(*events) -> bytes:
+    lines = [f"data: {json.dumps(event)}\n\n" for event in events]
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode("utf-8")
+
+
+def _chunk(delta, finish_reason=None, **extra):
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "primary",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        **extra,
+    }
+
+
+USAGE = {"prompt_tokens": 120, "completion_tokens": 8, "prompt_tokens_details": {"cached_tokens": 100}}
+
+
+def _client(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        body = _sse(
+            _chunk({"role": "assistant", "content": "Bon"}),
+            _chunk({"content": "jour."}),
+            _chunk({}, finish_reason="stop"),
+            {**_chunk({}), "choices": [], "usage": USAGE},
+        )
+        return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+    return LLMClient(
+        api_key="test",
+        primary_model="primary",
+        fallback_model="fallback",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def test_chat_stream_requests_usage_and_yields_chunks():
+    requests = []
+
+    async def run():
+        client = _client(requests)
+        stream = await client.chat([{"role": "user", "content": "Allo"}], stream=True)
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(run())
+
+    # A real SDK stream, not the error generator (which yields plain strings)
+    assert all(hasattr(chunk, "choices") for chunk in chunks)
+    text = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+    assert text == "Bonjour."
+
+    assert len(requests) == 1  # no fallback retry
+    assert requests[0]["model"] == "primary"
+    assert requests[0]["stream_options"] == {"include_usage": True}
+
+    usages = [LLMClient.stream_usage(chunk) for chunk in chunks]
+    assert [u for u in usages if u] == [
+        {"input_tokens": 120, "output_tokens": 8, "cached_input_tokens": 100}
+    ]
+
+
+def test_stream_usage_reads_groq_extension():
+    chunk = {"choices": [], "x_groq": {"usage": {"prompt_tokens": 50, "completion_tokens": 5}}}
+    assert LLMClient.stream_usage(chunk) == {"input_tokens": 50, "output_tokens": 5, "cached_input_tokens": 0}
@@ -0,0 +1,74 @@
+"""Tests for the shared response cache key."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from voice.conversation import ConversationManager, ConversationState
+from voice.response_cache import ResponseCache
+
+
+def _cache_key(cache: ResponseCache, messages, current_time=None):
+    """Build the live-path cache key for a history without a full call."""
+    manager = SimpleNamespace(
+        state=ConversationState.LISTENING,
+        language="fr",
+        messages=messages,
+        response_cache=cache,
+    )
+    return ConversationManager._response_cache_key(manager, current_time)
+
+
+def test_same_caller_turns_after_different_prompts_miss():
+    cache = ResponseCache()
+    history_a = [
+        {"role": "assistant", "content": "Voulez-vous prendre un rendez-vous?"},
+        {"role": "user", "content": "Oui"},
+    ]
+    history_b = [
+        {"role": "assistant", "content": "Avez-vous votre carte RAMQ?"},
+        {"role": "user", "content": "Oui"},
+    ]
+
+    key_a = _cache_key(cache, history_a)
+    key_b = _cache_key(cache, history_b)
+    assert key_a and key_b and key_a != key_b
+
+    cache.set(key_a, "Parfait, quel type de visite?")
+    assert cache.get(key_b) is None
+    assert cache.get(key_a) == "Parfait, quel type de visite?"
+
+
+def test_same_history_hits():
+    cache = ResponseCache()
+    history = [
+        {"role": "assistant", "content": "Bonjour, comment puis-je vous aider?"},
+        {"role": "user", "content": "Quelles sont vos heures?"},
+    ]
+    cache.set(_cache_key(cache, history), "Nous sommes ouverts de 9h à 18h.")
+
+    same = [dict(msg) for msg in history]
+    same[1]["content"] = "quelles sont vos heures"
+    assert cache.get(_cache_key(cache, same)) == "Nous sommes ouverts de 9h à 18h."
+
+
+def test_same_history_in_another_hour_misses():
+    cache = ResponseCache()
+    history = [
+        {"role": "assistant", "content": "Bonjour, comment puis-je vous aider?"},
+        {"role": "user", "content": "Êtes-vous ouverts présentement?"},
+    ]
+    cache.set(_cache_key(cache, history, datetime(2026, 3, 2, 17, 10)), "Oui, nous sommes ouverts.")
+
+    assert cache.get(_cache_key(cache, history, datetime(2026, 3, 2, 17, 50))) == "Oui, nous sommes ouverts."
+    assert cache.get(_cache_key(cache, history, datetime(2026, 3, 2, 18, 5))) is None
+    assert cache.get(_cache_key(cache, history, datetime(2026, 3, 3, 17, 10))) is None
+
+
+def test_tool_history_is_not_cacheable():
+    cache = ResponseCache()
+    history = [
+        {"role": "user", "content": "Je veux un rendez-vous"},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "1"}]},
+        {"role": "tool", "tool_call_id": "1", "content": "[]"},
+    ]
+    assert _cache_key(cache, history) is None
@@ -6,14 +6,54 @@ Compatible with Deepgram SDK v3.5+.
 
 import asyncio
 import logging
+import re
 import time
 import threading
 from collections import deque
-from typing import Callable, Optional, Any
+from typing import Callable, Dict, Optional, Any
 from deepgram import DeepgramClient, LiveTranscriptionEvents, LiveOptions
 
 logger = logging.getLogger(__name__)
 
+# Whole-word French indicators used for language detection.
+# Matched against tokens, so 'un' no longer fires inside 'understand'.
+FRENCH_INDICATORS = frozenset({
+    'bonjour', 'merci', 'oui', 'non', 'je', 'vous', 'rendez-vous',
+    'docteur', "s'il", 'plaît', 'clinique', 'santé', 'médecin',
+    'disponible', 'quand', "aujourd'hui", 'demain', 'semaine',
+    'voudrais', 'pouvez', 'avez', 'est-ce', 'comment', 'pourquoi',
+    'salut', 'allo', 'allô', 'bien', 'mal', 'ça', "c'est",
+    'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf', 'dix'
+})
+
+_WORD_RE = re.compile(r"[a-zàâäéèêëîïôöùûüç'-]+")
+
+# Live transcription options are identical for every call - build once.
+# Multilingual auto-detect, Twilio mulaw 8kHz, reduced-latency endpointing.
+LIVE_OPTIONS = LiveOptions(
+    model="nova-2",
+    language="multi",  # Auto-detect language
+    encoding="mulaw",
+    sample_rate=8000,
+    channels=1,
+    interim_results=True,
+    vad_events=True,
+    endpointing=1500,  # 1500ms for faster response (reduced from 2500ms)
+    smart_format=True, # Improved number formatting (514-123-4567)
+)
+
+# Shared Deepgram clients (one per API key) - only the live socket is per-call
+_deepgram_clients: Dict[str, DeepgramClient] = {}
+
+
+def get_deepgram_client(api_key: str) -> DeepgramClient:
+    """Get or create the process-wide Deepgram client for an API key."""
+    client = _deepgram_clients.get(api_key)
+    if client is None:
+        client = DeepgramClient(api_key)
+        _deepgram_clients[api_key] = client
+    return client
+
 
 class DeepgramASRClient:
     """
@@ -47,6 +87,7 @@ class DeepgramASRClient:
         # Silence timer fallback (for when UtteranceEnd doesn't fire)
         self._silence_timer: Optional[asyncio.TimerHandle] = None
         self._silence_timeout = silence_timeout
+        self._silence_deadline = 0.0
         self._has_pending_final = False
 
         # Connection ready event for synchronization
@@ -63,20 +104,7 @@ class DeepgramASRClient:
             self._loop = asyncio.get_running_loop()
             logger.info(f"🎙️ Event loop captured: {self._loop}")
 
-            self.client = DeepgramClient(self.api_key)
-
-            # Configure for multilingual support with reduced latency
-            options = LiveOptions(
-                model="nova-2",
-                language="multi",  # Auto-detect language
-                encoding="mulaw",
-                sample_rate=8000,
-                channels=1,
-                interim_results=True,
-                vad_events=True,
-                endpointing=1500,  # 1500ms for faster response (reduced from 2500ms)
-                smart_format=True, # Improved number formatting (514-123-4567)
-            )
+            self.client = get_deepgram_client(self.api_key)
 
             # Create WebSocket connection for live transcription
             self.connection = self.client.listen.live.v("1")
@@ -91,7 +119,7 @@ class DeepgramASRClient:
 
             # Start the connection (synchronous in SDK v3.5+)
             logger.info("🎙️ Starting Deepgram connection...")
-            result = self.connection.start(options)
+            result = self.connection.start(LIVE_OPTIONS)
 
             if not result:
                 logger.error("❌ Failed to start Deepgram connection")
@@ -111,9 +139,7 @@ class DeepgramASRClient:
                 return False
 
         except Exception as e:
-            logger.error(f"❌ Deepgram connection error: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Deepgram connection error: {e}")
             return False
 
     @property
@@ -158,15 +184,10 @@ class DeepgramASRClient:
 
             # Quick preview of transcript for debugging
             try:
-                channel = getattr(result, 'channel', None)
-                if channel:
-                    alts = getattr(channel, 'alternatives', [])
-                    if alts:
-                        text = getattr(alts[0], 'transcript', '')
-                        is_final = getattr(result, 'is_final', False)
-                        if text:
-                            logger.info(f"📝 Transcript received: '{text}' (final={is_final})")
-            except:
+                text = result.channel.alternatives[0].transcript
+                if text:
+                    logger.info(f"📝 Transcript received: '{text}' (final={result.is_final})")
+            except (AttributeError, IndexError):
                 pass
 
             # Schedule async work on the event loop
@@ -248,18 +269,32 @@ class DeepgramASRClient:
                     logger.error(f"❌ Error processing queued callback: {e}")
 
     def _reset_silence_timer(self):
-        """Reset silence timer after final transcript."""
-        if self._silence_timer and not self._silence_timer.cancelled():
-            self._silence_timer.cancel()
+        """
+        Reset silence timer after final transcript.
+        Pushes the deadline forward; the pending timer re-arms itself when
+        it fires early, so bursts of finals don't churn TimerHandles.
+        """
+        if not (self._loop and self._is_connected):
+            return
 
-        if self._loop and self._is_connected:
-            self._silence_timer = self._loop.call_later(
-                self._silence_timeout,
+        self._silence_deadline = self._loop.time() + self._silence_timeout
+        if self._silence_timer is None or self._silence_timer.cancelled():
+            self._silence_timer = self._loop.call_at(
+                self._silence_deadline,
                 self._on_silence_timeout
             )
 
     def _on_silence_timeout(self):
         """Fallback: trigger utterance end after silence timeout."""
+        if self._loop and self._loop.time() < self._silence_deadline:
+            # Deadline was pushed back by a later final - re-arm
+            self._silence_timer = self._loop.call_at(
+                self._silence_deadline,
+                self._on_silence_timeout
+            )
+            return
+
+        self._silence_timer = None
         if self._has_pending_final:
             logger.info("🎤 Silence timeout - triggering response (fallback)")
             self._has_pending_final = False
@@ -275,27 +310,20 @@ class DeepgramASRClient:
     async def _handle_transcript(self, result: Any):
         """Process transcript result."""
         try:
-            # Get channel data - SDK v3 structure
-            channel = getattr(result, 'channel', None)
-            if not channel:
-                return
-
-            alternatives = getattr(channel, 'alternatives', [])
-            if not alternatives:
+            # SDK v3 results always carry channel/alternatives/is_final;
+            # a single try frame is cheaper than a chain of getattr defaults
+            try:
+                transcript = result.channel.alternatives[0].transcript
+                is_final = result.is_final
+            except (AttributeError, IndexError):
                 return
 
-            alternative = alternatives[0]
-            transcript = getattr(alternative, 'transcript', "")
-
             if not transcript:
                 return
 
             # Detect language from transcript
             detected_lang = self._detect_language(transcript)
 
-            # Check if this is a final result
-            is_final = getattr(result, 'is_final', True)
-
             # Update language detection (only if not locked)
             if is_final and not self.language_locked:
                 self._update_language(detected_lang)
@@ -326,19 +354,8 @@ class DeepgramASRClient:
         Detect language from transcript content.
         Returns 'fr' or 'en'.
         """
-        french_indicators = [
-            'bonjour', 'merci', 'oui', 'non', 'je', 'vous', 'rendez-vous',
-            'docteur', "s'il vous plaît", 'clinique', 'santé', 'médecin',
-            'disponible', 'quand', "aujourd'hui", 'demain', 'semaine',
-            'voudrais', 'pouvez', 'avez', 'est-ce', 'comment', 'pourquoi',
-            'salut', 'allo', 'allô', 'bien', 'mal', 'ça', 'c\'est',
-            'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf', 'dix'
-        ]
-
-        transcript_lower = transcript.lower()
-        french_matches = sum(1 for word in french_indicators if word in transcript_lower)
-
-        return 'fr' if french_matches > 0 else 'en'
+        tokens = _WORD_RE.findall(transcript.lower().replace('’', "'"))
+        return 'fr' if FRENCH_INDICATORS.intersection(tokens) else 'en'
 
     def _update_language(self, detected_lang: str):
         """Update the detected language and lock it to prevent mid-call switching."""
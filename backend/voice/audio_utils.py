@@ -142,5 +142,7 @@ class AudioConverter:
         """
         # For mulaw, each byte is one sample
         num_samples = len(audio_bytes)
-        duration_seconds = num_samples / sample_rate
-        return int(duration_seconds * 1000)
+        if sample_rate == 8000:
+            # 1000 / 8000 == 1 / 8
+            return num_samples >> 3
+        return (num_samples * 1000) // sample_rate
@@ -4,22 +4,134 @@ State machine for managing voice conversations.
 Supports both traditional turn-based and PersonaPlex full-duplex modes.
 """
 
+import hashlib
 import logging
 import json
+import random
+import re
 import asyncio
-from typing import Optional, List, Dict, Any, AsyncIterator, Callable
-from datetime import datetime, timedelta
+import time
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Set, Tuple
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
-from llm.client import LLMClient
+from llm.client import LLMClient, get_llm_client
 from llm.prompts import SystemPrompts
-from llm.function_calls import format_slots_for_speech, format_booking_confirmation
+from llm.personaplex_client import PersonaPlexClient, PersonaPlexConfig, PersonaPlexEvent
+from llm.function_calls import TOOLS_FINGERPRINT, format_slots_for_speech, format_booking_confirmation
 from storage.firebase_client import get_firebase_client
+from storage.transcript_writer import get_transcript_writer
 from services.booking import get_booking_service
+from services.notification import get_notification_service
+from services.cost_tracker import CostService
+from .response_cache import get_response_cache
+
+# pyahocorasick is optional - keyword checks fall back to a compiled regex
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Clinic timezone for the datetime context sent with each request
+_CLINIC_TZ = ZoneInfo("America/Montreal")
+
+# RAMQ health card number: 4 letters + 8 digits, spaces/hyphens allowed when spoken
+_RAMQ_SEPARATORS = re.compile(r'[\s-]')
+_RAMQ_FORMAT = re.compile(r'^[A-Z]{4}\d{8}$')
+
+# Typographic variants the ASR may emit for keyword characters
+_MATCH_FOLDS = str.maketrans({"’": "'", "œ": "oe"})
+
+
+def _normalize_for_matching(text: str) -> str:
+    """Casefold caller text and fold typographic variants (’, œ) for keyword checks."""
+    return text.casefold().translate(_MATCH_FOLDS)
+
+
+# Keyword categories; when several match, the one listed first in a matcher wins
+EMERGENCY = "emergency"
+TRANSFER = "transfer"
+
+
+class _KeywordMatcher:
+    """
+    Single-pass matcher for categorized keywords.
+    Uses an Aho-Corasick automaton, or one regex alternation if pyahocorasick is missing.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        self._rank = {category: rank for rank, category in enumerate(categories)}
+        self._lookup: Dict[str, str] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._lookup.setdefault(_normalize_for_matching(keyword), category)
+
+        if ahocorasick is None:
+            self._automaton = None
+            # Longest first so overlapping phrases match the same way as the automaton
+            ordered = sorted(self._lookup, key=len, reverse=True)
+            self._regex = re.compile("|".join(map(re.escape, ordered)))
+        else:
+            self._regex = None
+            self._automaton = ahocorasick.Automaton()
+            for keyword, category in self._lookup.items():
+                self._automaton.add_word(keyword, category)
+            self._automaton.make_automaton()
+
+    def _matches(self, text: str):
+        """Yield the category of every keyword found in text."""
+        if self._automaton is not None:
+            return (category for _, category in self._automaton.iter(text))
+        return (self._lookup[match.group()] for match in self._regex.finditer(text))
+
+    def scan(self, text: str) -> Optional[str]:
+        """Return the highest-priority category found in (normalized) text, or None."""
+        best = None
+        for category in self._matches(text):
+            if self._rank[category] == 0:
+                return category
+            if best is None or self._rank[category] < self._rank[best]:
+                best = category
+        return best
+
+
+# Punctuation the TTS chunker splits on (see TwilioMediaStreamHandler._speak_streaming)
+_STREAM_BREAKS = frozenset(".!?,")
+
+
+def _message_chars(message: Dict[str, Any]) -> int:
+    """Length of a message's text content (0 for tool-call messages)."""
+    content = message.get("content")
+    return len(content) if isinstance(content, str) else 0
+
+
+@lru_cache(maxsize=4)
+def _static_system_prompt(language: str, emotion_level: str) -> str:
+    """Build the static (time-independent) system prompt once per language."""
+    prompt = SystemPrompts.get_prompt(language=language, emotion_level=emotion_level)
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    # Compare across deploys/processes: a change here means the provider prompt cache is cold
+    logger.info(f"🔒 Static prefix ({language}/{emotion_level}): prompt={prompt_hash} tools={TOOLS_FINGERPRINT}")
+    return prompt
+
+
+def _format_timestamp(ts_ns: int) -> str:
+    """Format a time.time_ns() value as a naive UTC ISO string (dashboard format)."""
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _storage_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a transcript entry's ts_ns into the ISO timestamp stored in Firestore."""
+    if "ts_ns" not in entry:
+        return entry
+    stored = {k: v for k, v in entry.items() if k != "ts_ns"}
+    stored["timestamp"] = _format_timestamp(entry["ts_ns"])
+    return stored
+
 
 class ConversationState(Enum):
     """States in the conversation flow."""
@@ -44,6 +156,14 @@ class ConversationMode(Enum):
     FULL_DUPLEX = "full_duplex"
 
 
+# States where the reply depends only on what the caller said (no booking context)
+CACHEABLE_STATES = {
+    ConversationState.GREETING,
+    ConversationState.LISTENING,
+    ConversationState.FAQ,
+}
+
+
 class ConversationManager:
     """
     Manages the conversation state and flow.
@@ -54,6 +174,22 @@ class ConversationManager:
     2. Full-duplex (PersonaPlex): Continuous bidirectional audio/text streaming
     """
 
+    # One instance per live call: fixed attribute layout instead of a per-instance __dict__
+    __slots__ = (
+        "settings", "call_sid", "caller_number", "state", "language",
+        "tts_language", "mode", "personaplex_client", "_llm_client",
+        "messages", "transcript", "slots", "available_slots", "_slots_by_id",
+        "_slots_prefetch", "response_cache", "firebase", "booking_service",
+        "transcript_writer", "booking_made", "start_time", "_start_monotonic",
+        "ai_response_count", "caller_message_count", "total_input_tokens",
+        "total_output_tokens", "total_tts_chars", "total_cached_input_tokens",
+        "_input_chars", "_output_chars", "_history_chars",
+        "_filler_used_this_turn", "_compaction_task", "_duplex_session_active",
+        "_emergency_triggered", "_audio_push_task", "_event_loop_task",
+        "_last_caller_normalized", "_transcript_queue",
+        "_transcript_flush_task", "_transcript_ref", "_transcript_keys",
+    )
+
     # Emergency keywords that trigger immediate transfer
     EMERGENCY_KEYWORDS_FR = [
         "douleur thoracique", "mal au coeur", "douleur poitrine",
@@ -68,6 +204,95 @@ class ConversationManager:
         "emergency", "911", "ambulance"
     ]
 
+    # Phrases indicating the caller wants to speak to a human
+    TRANSFER_PHRASES_FR = [
+        "parler à quelqu'un", "parler à une personne", "parler à un humain",
+        "une vraie personne", "réceptionniste", "quelqu'un d'autre"
+    ]
+
+    TRANSFER_PHRASES_EN = [
+        "speak to someone", "speak to a person", "speak to a human",
+        "real person", "receptionist", "someone else", "talk to a human"
+    ]
+
+    # One emergency + transfer matcher per language, built once at import
+    _KEYWORD_MATCHERS = {
+        "fr": _KeywordMatcher({EMERGENCY: EMERGENCY_KEYWORDS_FR, TRANSFER: TRANSFER_PHRASES_FR}),
+        "en": _KeywordMatcher({EMERGENCY: EMERGENCY_KEYWORDS_EN, TRANSFER: TRANSFER_PHRASES_EN}),
+    }
+
+    # Localized canned responses, resolved once at import time
+    ERROR_RESPONSES = {
+        "fr": "Oups, pardon! J'ai manqué ça. Pouvez-vous me répéter s'il vous plaît?",
+        "en": "Oops, sorry about that! I missed that. Could you say that again for me?",
+    }
+
+    # More natural, conversational fillers that sound human
+    FILLER_PHRASES = {
+        "fr": (
+            "Parfait, je regarde ça pour vous.",
+            "Super, laissez-moi vérifier nos disponibilités.",
+            "Excellent, je consulte notre calendrier.",
+            "Bien sûr, je vérifie ça tout de suite.",
+            "D'accord, je regarde ce qu'on a de disponible.",
+        ),
+        "en": (
+            "Perfect, let me check that for you.",
+            "Great, let me look at our availability.",
+            "Absolutely, I'll check our calendar.",
+            "Sure thing, let me see what we have.",
+            "Of course, I'm checking our schedule now.",
+        ),
+    }
+    _FILLER_PHRASE_SET = frozenset(phrase for phrases in FILLER_PHRASES.values() for phrase in phrases)
+
+    CANCEL_SUCCESS = {
+        "fr": "Votre rendez-vous {confirmation_number} a été annulé. Y a-t-il autre chose que je peux faire pour vous?",
+        "en": "Your appointment {confirmation_number} has been cancelled. Is there anything else I can help you with?",
+    }
+
+    CANCEL_NOT_FOUND = {
+        "fr": "Je n'ai pas pu trouver ce rendez-vous. Pouvez-vous vérifier le numéro de confirmation?",
+        "en": "I couldn't find that appointment. Could you please verify the confirmation number?",
+    }
+
+    # Live transcript writes are flushed in batches of up to
+    # TRANSCRIPT_FLUSH_MAX entries, at most TRANSCRIPT_FLUSH_INTERVAL seconds apart
+    TRANSCRIPT_FLUSH_MAX = 450
+    TRANSCRIPT_FLUSH_INTERVAL = 0.25
+
+    # Streaming: tokens per chunk yielded to TTS (grows from MIN by GROWTH up to MAX)
+    STREAM_BATCH_MIN = 1
+    STREAM_BATCH_GROWTH = 3
+    STREAM_BATCH_MAX = 32
+
+    # Upper bound on LLM -> tool -> LLM hops within one caller turn
+    MAX_TOOL_ROUNDS = 5
+
+    # Process-wide cap on background outbound work (SMS confirmations, call
+    # records) so bursts queue here instead of piling onto the providers
+    # (LLM requests are capped in llm.client)
+    _OUTBOUND_SEM = asyncio.Semaphore(32)
+
+    # History compaction: once the history passes settings.max_history_tokens,
+    # everything but the last HISTORY_KEEP_MESSAGES is folded into a summary
+    HISTORY_KEEP_MESSAGES = 6
+
+    # Tool name -> handler method name (see handle_tool_call)
+    _TOOL_HANDLERS = {
+        "get_available_slots": "_handle_get_slots",
+        "book_appointment": "_handle_book_appointment",
+        "transfer_to_human": "_handle_transfer",
+        "cancel_appointment": "_handle_cancel_appointment",
+    }
+
+    # Tools whose result is already the caller-facing reply (bilingual canned text)
+    _TERMINAL_TOOLS = frozenset({"transfer_to_human", "cancel_appointment"})
+
+    # Terminal tools whose reply is only an announcement: not spoken when the
+    # model already said something in that round (no "I'll transfer you" twice)
+    _ANNOUNCEMENT_TOOLS = frozenset({"transfer_to_human"})
+
     def __init__(self, settings, call_sid: str, caller_number: str):
         self.settings = settings
         self.call_sid = call_sid
@@ -76,6 +301,7 @@ class ConversationManager:
         # State
         self.state = ConversationState.GREETING
         self.language = settings.default_language  # Default to French
+        self.tts_language = self._tts_language_for(self.language)
 
         # Determine conversation mode
         self.mode = (
@@ -93,6 +319,7 @@ class ConversationManager:
         # Conversation history (used for both modes)
         self.messages: List[Dict[str, str]] = []
         self.transcript: List[Dict[str, Any]] = []
+        self._transcript_keys: Set[Tuple[Any, Any, Any]] = set()
 
         # Booking slots (extracted during conversation)
         self.slots: Dict[str, Any] = {
@@ -104,6 +331,13 @@ class ConversationManager:
 
         # Available slots from calendar
         self.available_slots: List[Dict] = []
+        self._slots_by_id: Dict[str, Dict] = {}
+
+        # Speculative get_available_slots call: ((visit_type, preferred_date, days_to_search), task)
+        self._slots_prefetch: Optional[Tuple[Tuple, asyncio.Task]] = None
+
+        # Shared cache for repeated FAQ-style turns
+        self.response_cache = get_response_cache()
 
         # Firebase client
         self.firebase = get_firebase_client(settings.firebase_project_id)
@@ -111,9 +345,20 @@ class ConversationManager:
         # Booking service (uses Firestore)
         self.booking_service = get_booking_service(self.firebase)
 
+        # Background writer for end-of-call Firestore updates
+        self.transcript_writer = get_transcript_writer(self.firebase)
+
+        # Live transcript entries, flushed to Firestore in batches
+        self._transcript_ref = (
+            self.firebase.transcript_collection(call_sid) if self.firebase else None
+        )
+        self._transcript_queue: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = asyncio.Queue()
+        self._transcript_flush_task: Optional[asyncio.Task] = None
+
         # Track booking status
         self.booking_made = False
         self.start_time = datetime.utcnow()
+        self._start_monotonic = time.monotonic()  # durations immune to wall-clock jumps
 
         # Track conversation metrics for status determination
         self.ai_response_count = 0
@@ -122,11 +367,23 @@ class ConversationManager:
         # Usage metrics for cost tracking
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cached_input_tokens = 0
         self.total_tts_chars = 0
 
+        # Running character totals of LLM messages (token estimate when usage isn't reported)
+        self._input_chars = 0
+        self._output_chars = 0
+        self._history_chars = 0  # Current history size (drops on compaction)
+
         # Prevent duplicate filler phrases during tool call chains
         self._filler_used_this_turn = False
 
+        # Latest caller turn, normalized once for keyword checks
+        self._last_caller_normalized = ""
+
+        # Background history compaction (turn-based mode)
+        self._compaction_task: Optional[asyncio.Task] = None
+
         # Full-duplex specific state
         self._duplex_session_active = False
         self._emergency_triggered = False
@@ -139,21 +396,12 @@ class ConversationManager:
         self._create_call_record()
 
     def _init_turn_based_client(self):
-        """Initialize the traditional turn-based LLM client."""
-        self.llm_client = LLMClient(
-            api_key=self.settings.groq_api_key,
-            primary_model=self.settings.groq_model_primary,
-            fallback_model=self.settings.groq_model_fallback
-        )
+        """Initialize the traditional turn-based LLM client (lazily)."""
+        self._llm_client: Optional[LLMClient] = None
         self.personaplex_client = None
 
     def _init_personaplex_client(self):
         """Initialize the PersonaPlex full-duplex client."""
-        from llm.personaplex_client import (
-            PersonaPlexClient,
-            PersonaPlexConfig
-        )
-
         # Build PersonaPlex config from settings
         config = PersonaPlexConfig(
             endpoint_url=self.settings.personaplex_endpoint,
@@ -171,19 +419,37 @@ class ConversationManager:
 
         self.personaplex_client = PersonaPlexClient(config)
 
-        # Also keep turn-based client as fallback
-        self.llm_client = LLMClient(
-            api_key=self.settings.groq_api_key,
-            primary_model=self.settings.groq_model_primary,
-            fallback_model=self.settings.groq_model_fallback
-        )
+        # Also keep turn-based client as fallback (created on first use)
+        self._llm_client: Optional[LLMClient] = None
+
+    @property
+    def llm_client(self) -> LLMClient:
+        """Turn-based LLM client (shared across calls), looked up on first use."""
+        if self._llm_client is None:
+            self._llm_client = get_llm_client(
+                api_key=self.settings.groq_api_key,
+                primary_model=self.settings.groq_model_primary,
+                fallback_model=self.settings.groq_model_fallback
+            )
+        return self._llm_client
+
+    @property
+    def system_prompt(self) -> str:
+        """Static (time-independent) system prompt for the current language."""
+        return _static_system_prompt(self.language, self.settings.emotion_level)
 
     def update_language(self, detected_language: str):
         """Update the conversation language dynamically."""
         if detected_language != self.language:
             self.language = detected_language
+            self.tts_language = self._tts_language_for(detected_language)
             logger.info(f"Language updated to: {detected_language}")
 
+    @staticmethod
+    def _tts_language_for(language: str) -> str:
+        """TTS voice locale for a conversation language code."""
+        return "fr-CA" if language == "fr" else "en-CA"
+
     def get_greeting(self) -> str:
         """Get the initial greeting in the appropriate language."""
         return SystemPrompts.get_greeting(self.language)
@@ -214,7 +480,7 @@ class ConversationManager:
         logger.info(f"Starting full-duplex session for call {self.call_sid}")
 
         # Build system prompt with current context
-        current_time = datetime.now(ZoneInfo("America/Montreal"))
+        current_time = datetime.now(_CLINIC_TZ)
         system_prompt = SystemPrompts.get_prompt(
             language=self.language,
             emotion_level=self.settings.emotion_level,
@@ -268,8 +534,6 @@ class ConversationManager:
         - Tool calls (executed and results returned)
         - Emergency interruptions
         """
-        from llm.personaplex_client import PersonaPlexEvent
-
         try:
             async for event in self.personaplex_client.events():
                 if self._emergency_triggered:
@@ -322,21 +586,22 @@ class ConversationManager:
         entry = {
             "speaker": "caller",
             "text": text,
-            "timestamp": datetime.utcnow().isoformat(),
+            "ts_ns": time.time_ns(),
             "language": self.language
         }
-        self.transcript.append(entry)
-        self.messages.append({"role": "user", "content": text})
+        index = self._append_transcript(entry)
+        self._append_message({"role": "user", "content": text})
 
         # Save to Firebase
-        await self._save_transcript_entry(entry)
+        self._save_transcript_entry(index, entry)
 
-        # Check for emergency keywords
-        if self._is_emergency(text.lower()):
+        # One pass for emergency keywords and transfer requests
+        keyword_match = self._scan_keywords(_normalize_for_matching(text))
+
+        if keyword_match == EMERGENCY:
             await self._trigger_emergency_interrupt(text)
 
-        # Check for transfer request
-        if self._wants_transfer(text.lower()):
+        elif keyword_match == TRANSFER:
             self.state = ConversationState.TRANSFERRING
             # PersonaPlex will handle the response
 
@@ -346,13 +611,15 @@ class ConversationManager:
         transcript_entries = self.personaplex_client.get_transcript()
 
         for entry in transcript_entries:
-            if entry.get("speaker") == "agent" and entry not in self.transcript:
-                self.transcript.append(entry)
-                self.messages.append({
+            if entry.get("speaker") != "agent":
+                continue
+            index = self._append_transcript(entry)
+            if index is not None:
+                self._append_message({
                     "role": "assistant",
                     "content": entry.get("text", "")
                 })
-                await self._save_transcript_entry(entry)
+                self._save_transcript_entry(index, entry)
 
     async def _personaplex_tool_handler(
         self,
@@ -408,11 +675,11 @@ class ConversationManager:
             entry = {
                 "speaker": "system",
                 "text": f"EMERGENCY DETECTED: {detected_text}",
-                "timestamp": datetime.utcnow().isoformat(),
+                "ts_ns": time.time_ns(),
                 "emergency": True
             }
-            self.transcript.append(entry)
-            await self._save_transcript_entry(entry)
+            index = self._append_transcript(entry)
+            self._save_transcript_entry(index, entry)
 
     async def end_duplex_session(self) -> Dict[str, Any]:
         """
@@ -442,15 +709,14 @@ class ConversationManager:
 
             # Merge any remaining transcript entries
             for entry in session_summary.get("transcript", []):
-                if entry not in self.transcript:
-                    self.transcript.append(entry)
+                self._append_transcript(entry)
 
         # Save final transcript
         await self.save_transcript()
 
         return {
             "mode": "full_duplex",
-            "duration_seconds": int((datetime.utcnow() - self.start_time).total_seconds()),
+            "duration_seconds": self._elapsed_seconds(),
             "emergency_triggered": self._emergency_triggered
         }
 
@@ -465,42 +731,154 @@ class ConversationManager:
         entry = {
             "speaker": "caller",
             "text": text,
-            "timestamp": datetime.utcnow().isoformat(),
+            "ts_ns": time.time_ns(),
             "language": self.language
         }
-        self.transcript.append(entry)
+        index = self._append_transcript(entry)
 
         # Add to LLM message history
-        self.messages.append({"role": "user", "content": text})
+        self._append_message({"role": "user", "content": text})
+        self._last_caller_normalized = _normalize_for_matching(text)
 
         # Save immediately to Firebase for live updates
-        await self._save_transcript_entry(entry)
+        self._save_transcript_entry(index, entry)
 
     async def add_assistant_message(self, text: str):
         """Add an assistant message to the transcript and save immediately."""
         entry = {
             "speaker": "assistant",
             "text": text,
-            "timestamp": datetime.utcnow().isoformat(),
+            "ts_ns": time.time_ns(),
             "language": self.language
         }
-        self.transcript.append(entry)
+        index = self._append_transcript(entry)
 
         # Add to LLM message history
-        self.messages.append({"role": "assistant", "content": text})
+        self._append_message({"role": "assistant", "content": text})
 
         # Save immediately to Firebase for live updates
-        await self._save_transcript_entry(entry)
+        self._save_transcript_entry(index, entry)
 
-    async def _save_transcript_entry(self, entry: Dict):
-        """Save a single transcript entry for real-time updates."""
-        if self.firebase and self.firebase.is_connected:
-            try:
-                transcript_ref = self.firebase.db.collection("calls").document(self.call_sid).collection("transcript")
-                doc_ref = transcript_ref.document(f"{len(self.transcript)-1:04d}")
-                doc_ref.set(entry)
-            except Exception as e:
-                logger.error(f"Error saving transcript entry: {e}")
+        self._maybe_compact_history()
+
+    def _append_transcript(self, entry: Dict[str, Any]) -> Optional[int]:
+        """
+        Append a transcript entry unless the same utterance is already recorded.
+
+        Returns:
+            The entry's position in the transcript (its document id), or None if it was a duplicate
+        """
+        key = (entry.get("speaker"), entry.get("ts_ns", entry.get("timestamp")), entry.get("text"))
+        if key in self._transcript_keys:
+            return None
+        self._transcript_keys.add(key)
+        self.transcript.append(entry)
+        return len(self.transcript) - 1
+
+    def _append_message(self, message: Dict[str, Any]):
+        """Append a message to the LLM history, keeping the character totals current."""
+        self._count_message_chars(message)
+        self.messages.append(message)
+
+    def _count_message_chars(self, message: Dict[str, Any]):
+        """Add a message's content length to the history size and input/output totals."""
+        chars = _message_chars(message)
+        self._history_chars += chars
+        role = message.get("role")
+        if role in ("user", "system"):
+            self._input_chars += chars
+        elif role == "assistant":
+            self._output_chars += chars
+
+    def _maybe_compact_history(self):
+        """Start a background summary of old turns once the history gets long."""
+        if self.mode != ConversationMode.TURN_BASED:
+            return
+        if self._compaction_task and not self._compaction_task.done():
+            return
+
+        # Rough token count for the history (~4 chars per token)
+        if self._history_chars // 4 <= self.settings.max_history_tokens:
+            return
+
+        # Cut on a caller turn so tool calls stay paired with their results
+        cut = len(self.messages) - self.HISTORY_KEEP_MESSAGES
+        while cut > 0 and self.messages[cut].get("role") != "user":
+            cut -= 1
+        if cut < 2:
+            return
+
+        self._compaction_task = asyncio.create_task(self._compact_history(cut))
+
+    async def _compact_history(self, cut: int):
+        """Replace messages[:cut] with a single summary system message."""
+        try:
+            old_messages = self.messages[:cut]
+            summary = await self.llm_client.summarize(old_messages, self.language)
+            if not summary:
+                # Summarizer unavailable: keep the full history (tool results, confirmed
+                # slots) rather than a lossy summary; the next turn tries again
+                logger.warning(f"History summary failed for call {self.call_sid}, not compacting")
+                return
+
+            # New turns are only ever appended, so the first `cut` messages are unchanged
+            summary_message = {"role": "system", "content": f"Earlier in this call: {summary}"}
+            self._history_chars -= sum(map(_message_chars, old_messages))
+            self._count_message_chars(summary_message)
+            self.messages[:cut] = [summary_message]
+            logger.info(f"🗜️ Compacted {cut} messages into a summary for call {self.call_sid}")
+        except Exception as e:
+            logger.error(f"Error compacting conversation history: {e}")
+
+    def _save_transcript_entry(self, index: Optional[int], entry: Dict):
+        """Queue a transcript entry for the live Firestore write (index: its transcript position)."""
+        if self._transcript_ref is None or index is None:
+            return
+
+        if self._transcript_flush_task is None:
+            self._transcript_flush_task = asyncio.create_task(self._flush_transcript_entries())
+        self._transcript_queue.put_nowait((f"{index:04d}", entry))
+
+    async def _flush_transcript_entries(self):
+        """Write queued transcript entries in batches until the end-of-call sentinel."""
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            item = await self._transcript_queue.get()
+            if item is None:
+                return
+            pending = [item]
+
+            # Collect more entries until the batch is full or the window closes
+            deadline = loop.time() + self.TRANSCRIPT_FLUSH_INTERVAL
+            while len(pending) < self.TRANSCRIPT_FLUSH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._transcript_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    done = True
+                    break
+                pending.append(item)
+
+            await self.firebase.save_transcript_entries(
+                self._transcript_ref,
+                [(doc_id, _storage_entry(entry)) for doc_id, entry in pending]
+            )
+
+    async def _drain_transcript_entries(self):
+        """Flush any queued live transcript entries and stop the flusher."""
+        if self._transcript_flush_task is None:
+            return
+        self._transcript_queue.put_nowait(None)
+        try:
+            await self._transcript_flush_task
+        except Exception as e:
+            logger.error(f"Error flushing transcript entries: {e}")
+        self._transcript_flush_task = None
 
     async def get_response(self) -> Optional[str]:
         """
@@ -517,40 +895,43 @@ class ConversationManager:
         if not self.messages:
             return None
 
-        last_message = self.messages[-1].get("content", "").lower()
+        # One pass for emergency keywords and transfer requests
+        keyword_match = self._scan_keywords(self._last_caller_normalized)
 
-        # Check for emergency keywords
-        if self._is_emergency(last_message):
+        if keyword_match == EMERGENCY:
             return SystemPrompts.get_emergency_message(self.language)
 
-        # Check for transfer request
-        if self._wants_transfer(last_message):
+        if keyword_match == TRANSFER:
             self.state = ConversationState.TRANSFERRING
             return SystemPrompts.get_transfer_message(self.language)
 
+        # Serve repeated FAQ-style turns without an LLM round-trip
+        cache_key = self._response_cache_key()
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                self.ai_response_count += 1
+                return cached
+
         try:
-            # Inject emotion level and current time into system prompt
-            current_time = datetime.now(ZoneInfo("America/Montreal"))
-            system_prompt = SystemPrompts.get_prompt(
-                language=self.language,
-                emotion_level=self.settings.emotion_level,
-                current_time=current_time
-            )
+            # Current time goes after the history; the system prompt stays static
+            current_time = datetime.now(_CLINIC_TZ)
             response_data = await self.llm_client.get_response(
                 conversation_history=self.messages,
-                system_prompt=system_prompt,
-                language=self.language
+                system_prompt=self.system_prompt,
+                language=self.language,
+                dynamic_context=SystemPrompts.get_datetime_context(self.language, current_time)
             )
 
             # Track usage
-            if response_data.get("usage"):
-                self.total_input_tokens += response_data["usage"].get("input_tokens", 0)
-                self.total_output_tokens += response_data["usage"].get("output_tokens", 0)
+            self._record_usage(response_data.get("usage"))
 
             response = response_data.get("content", "")
 
             if response:
                 self.ai_response_count += 1
+                if cache_key and not response_data.get("tool_calls") and not response_data.get("error"):
+                    self.response_cache.set(cache_key, response)
 
             return response
 
@@ -573,177 +954,331 @@ class ConversationManager:
         if not self.messages:
             return
 
-        last_message = self.messages[-1].get("content", "").lower()
+        # One pass for emergency keywords and transfer requests
+        keyword_match = self._scan_keywords(self._last_caller_normalized)
 
-        # Check for emergency keywords - return full message immediately
-        if self._is_emergency(last_message):
+        # Emergency - return full message immediately
+        if keyword_match == EMERGENCY:
             yield SystemPrompts.get_emergency_message(self.language)
             return
 
-        # Check for transfer request
-        if self._wants_transfer(last_message):
+        if keyword_match == TRANSFER:
             self.state = ConversationState.TRANSFERRING
             yield SystemPrompts.get_transfer_message(self.language)
             return
 
-        # Stream LLM response
-        try:
-            # Inject emotion level and current time into system prompt
-            current_time = datetime.now(ZoneInfo("America/Montreal"))
-            system_prompt = SystemPrompts.get_prompt(
-                language=self.language,
-                emotion_level=self.settings.emotion_level,
-                current_time=current_time
-            )
-
-            tool_calls_buffer = []
-
-            async for chunk in self.llm_client.get_response_streaming(
-                conversation_history=self.messages,
-                system_prompt=system_prompt,
-                language=self.language
-            ):
-                # Handle OpenAI chunk object
-                if not hasattr(chunk, 'choices') or not chunk.choices:
-                    continue
-
-                delta = chunk.choices[0].delta
-
-                # 1. Handle Content
-                if delta.content:
-                    yield delta.content
-
-                # 2. Handle Tool Calls
-                if delta.tool_calls:
-                    for tc in delta.tool_calls:
-                        if len(tool_calls_buffer) <= tc.index:
-                             tool_calls_buffer.append({"id": "", "function": {"name": "", "arguments": ""}})
-
-                        existing = tool_calls_buffer[tc.index]
-
-                        if tc.id:
-                            existing["id"] = tc.id
+        # Serve repeated FAQ-style turns without an LLM round-trip
+        cache_key = self._response_cache_key()
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                self.ai_response_count += 1
+                yield cached
+                return
 
-                        if tc.function:
-                            if tc.function.name:
-                                existing["function"]["name"] += tc.function.name
-                            if tc.function.arguments:
-                                existing["function"]["arguments"] += tc.function.arguments
+        # Stream LLM response, running tool calls between rounds
+        try:
+            for _ in range(self.MAX_TOOL_ROUNDS):
+                tool_calls_buffer: List[Dict[str, Any]] = []
+                spoke = False
+                async for text in self._stream_llm_round(tool_calls_buffer, cache_key):
+                    spoke = spoke or bool(text.strip())
+                    yield text
 
-            self.ai_response_count += 1
+                if not tool_calls_buffer:
+                    return
 
-            # Process tool calls if any
-            if tool_calls_buffer:
                 logger.info(f"🛠️ Processing {len(tool_calls_buffer)} tool calls from stream")
 
+                # Terminal tools return the final spoken text, so no second LLM hop is needed
+                terminal = all(
+                    tc["function"]["name"] in self._TERMINAL_TOOLS for tc in tool_calls_buffer
+                )
+
                 # Yield filler phrase only once per turn to mask latency
-                if not self._filler_used_this_turn:
+                if not terminal and not self._filler_used_this_turn:
                     filler = self._get_filler_phrase()
                     if filler:
                         self._filler_used_this_turn = True
                         yield filler
 
-                for tool_call in tool_calls_buffer:
-                    func_name = tool_call["function"]["name"]
-                    func_args_str = tool_call["function"]["arguments"]
-
-                    try:
-                        func_args = json.loads(func_args_str)
-                        logger.info(f"🛠️ Executing tool: {func_name} args: {func_args}")
-
-                        # Execute tool
-                        tool_result = await self.handle_tool_call(func_name, func_args)
-
-                        # Add tool interaction to history
-                        self.messages.append({
-                            "role": "assistant",
-                            "tool_calls": [
-                                {
-                                    "id": tool_call["id"],
-                                    "type": "function",
-                                    "function": {
-                                        "name": func_name,
-                                        "arguments": func_args_str
-                                    }
-                                }
-                            ]
-                        })
-
-                        self.messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call["id"],
-                            "content": tool_result
-                        })
-
-                        # Recursively get new response (streaming)
-                        async for token in self.get_response_streaming():
-                            yield token
-
-                    except json.JSONDecodeError:
-                        logger.error(f"❌ Failed to parse arguments for tool {func_name}")
-                    except Exception as e:
-                        logger.error(f"❌ Error executing tool {func_name}: {e}")
+                tool_results = await self._execute_tool_calls(tool_calls_buffer)
+                if not tool_results:
+                    return
+
+                if terminal:
+                    reply = " ".join(
+                        result for name, result in tool_results
+                        if not (spoke and name in self._ANNOUNCEMENT_TOOLS)
+                    )
+                    if reply:
+                        yield reply
+                    return
+
+                # Tool results are in the history now, so the next round isn't cacheable
+                cache_key = None
+
+            logger.warning(f"Stopped after {self.MAX_TOOL_ROUNDS} tool-call rounds for call {self.call_sid}")
 
         except Exception as e:
             logger.error(f"Error streaming response: {e}")
             yield self._get_error_response()
 
-    # ==================== SHARED FUNCTIONALITY ====================
+    async def _stream_llm_round(
+        self,
+        tool_calls_buffer: List[Dict[str, Any]],
+        cache_key: Optional[str]
+    ) -> AsyncIterator[str]:
+        """
+        Stream one LLM request, yielding text and collecting tool calls.
+
+        Args:
+            tool_calls_buffer: Filled with the tool calls the model emitted
+            cache_key: Response cache key to store a tool-free reply under (or None)
+
+        Yields:
+            Text chunks for TTS
+        """
+        # Current time goes after the history; the system prompt stays static
+        current_time = datetime.now(_CLINIC_TZ)
+
+        content_parts = []
+
+        # Tokens are handed to TTS in batches that start at one token (low TTFT)
+        # and grow geometrically; punctuation flushes early so chunks end on a boundary
+        pending = ""
+        pending_tokens = 0
+        batch_size = self.STREAM_BATCH_MIN
+        usage = None
+
+        async for chunk in self.llm_client.get_response_streaming(
+            conversation_history=self.messages,
+            system_prompt=self.system_prompt,
+            language=self.language,
+            dynamic_context=SystemPrompts.get_datetime_context(self.language, current_time)
+        ):
+            # Handle OpenAI chunk object (usage rides on the last chunk or two)
+            usage = LLMClient.stream_usage(chunk) or usage
+            choices = getattr(chunk, "choices", None)
+            if not choices:
+                continue
+
+            delta = choices[0].delta
+
+            # 1. Handle Content
+            if delta.content:
+                content_parts.append(delta.content)
+                pending += delta.content
+                pending_tokens += 1
+                if pending_tokens >= batch_size or _STREAM_BREAKS.intersection(delta.content):
+                    yield pending
+                    pending = ""
+                    pending_tokens = 0
+                    batch_size = min(self.STREAM_BATCH_MAX, batch_size * self.STREAM_BATCH_GROWTH)
+
+            # 2. Handle Tool Calls
+            if delta.tool_calls:
+                for tc in delta.tool_calls:
+                    if len(tool_calls_buffer) <= tc.index:
+                        tool_calls_buffer.append({"id": "", "function": {"name": "", "arguments": ""}})
+
+                    existing = tool_calls_buffer[tc.index]
+
+                    if tc.id:
+                        existing["id"] = tc.id
+
+                    if tc.function:
+                        if tc.function.name:
+                            existing["function"]["name"] += tc.function.name
+                        if tc.function.arguments:
+                            existing["function"]["arguments"] += tc.function.arguments
+                            # Start the slot lookup as soon as its arguments are complete
+                            if (existing["function"]["name"] == "get_available_slots"
+                                    and "}" in tc.function.arguments):
+                                self._prefetch_slots(existing["function"]["arguments"])
+
+        if pending:
+            yield pending
+
+        # Once per round: a provider may repeat the totals on more than one chunk
+        self._record_usage(usage)
+        self.ai_response_count += 1
+
+        if cache_key and content_parts and not tool_calls_buffer:
+            self.response_cache.set(cache_key, "".join(content_parts))
+
+    async def _execute_tool_calls(self, tool_calls_buffer: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Run streamed tool calls and append each call + result to the history.
+
+        Returns:
+            (tool name, result) for the tool calls that ran successfully
+        """
+        tool_results = []
+        for index, tool_call in enumerate(tool_calls_buffer):
+            func_name = tool_call["function"]["name"]
+            func_args_str = tool_call["function"]["arguments"]
+
+            # Some providers omit the id; use a deterministic one so history stays stable
+            if not tool_call["id"]:
+                tool_call["id"] = f"call_{self.call_sid}_{len(self.messages)}_{index}"
+
+            try:
+                func_args = json.loads(func_args_str)
+                logger.info(f"🛠️ Executing tool: {func_name} args: {func_args}")
+
+                # Execute tool
+                tool_result = await self.handle_tool_call(func_name, func_args)
+
+                # Add tool interaction to history. Arguments are kept exactly as the
+                # model streamed them (never re-serialized) so the re-sent history
+                # matches the model's own output and the provider prefix cache holds.
+                assistant_message = {
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": tool_call["id"],
+                            "type": "function",
+                            "function": {
+                                "name": func_name,
+                                "arguments": func_args_str
+                            }
+                        }
+                    ]
+                }
+                self._append_message(assistant_message)
+
+                self._append_message({
+                    "role": "tool",
+                    "tool_call_id": tool_call["id"],
+                    "content": tool_result
+                })
+                tool_results.append((func_name, tool_result))
+
+            except json.JSONDecodeError:
+                logger.error(f"❌ Failed to parse arguments for tool {func_name}")
+            except Exception as e:
+                logger.error(f"❌ Error executing tool {func_name}: {e}")
+
+        # A prefetch nobody consumed would be stale by the next lookup
+        self._discard_slots_prefetch()
+
+        return tool_results
 
-    def _is_emergency(self, text: str) -> bool:
-        """Check if the message contains emergency keywords."""
-        keywords = (
-            self.EMERGENCY_KEYWORDS_FR if self.language == "fr"
-            else self.EMERGENCY_KEYWORDS_EN
+    @staticmethod
+    def _slot_query(arguments: Dict) -> Tuple:
+        """(visit_type, preferred_date, days_to_search) for get_available_slots arguments."""
+        return (
+            arguments.get("visit_type", "general"),
+            arguments.get("preferred_date"),
+            arguments.get("days_to_search", 7),
         )
-        return any(keyword in text for keyword in keywords)
-
-    def _wants_transfer(self, text: str) -> bool:
-        """Check if the caller wants to speak to a human."""
-        transfer_phrases_fr = [
-            "parler à quelqu'un", "parler à une personne", "parler à un humain",
-            "une vraie personne", "réceptionniste", "quelqu'un d'autre"
-        ]
-        transfer_phrases_en = [
-            "speak to someone", "speak to a person", "speak to a human",
-            "real person", "receptionist", "someone else", "talk to a human"
-        ]
-
-        phrases = transfer_phrases_fr if self.language == "fr" else transfer_phrases_en
-        return any(phrase in text for phrase in phrases)
+
+    def _prefetch_slots(self, arguments_json: str):
+        """
+        Start the slot lookup while the rest of the LLM round streams.
+
+        Only fires once the streamed argument JSON parses, so the lookup uses
+        the model's actual arguments and is never thrown away for a mismatch.
+        """
+        if self._slots_prefetch is not None:
+            return
+        try:
+            arguments = json.loads(arguments_json)
+        except json.JSONDecodeError:
+            return  # Still streaming
+        if not isinstance(arguments, dict):
+            return
+
+        query = self._slot_query(arguments)
+        visit_type, preferred_date, days_to_search = query
+        task = asyncio.create_task(self.booking_service.get_available_slots(
+            visit_type=visit_type,
+            preferred_date=preferred_date,
+            days_to_search=days_to_search,
+            language=self.language
+        ))
+        self._slots_prefetch = (query, task)
+
+    async def _take_prefetched_slots(self, query: Tuple) -> Optional[List[Dict]]:
+        """Return the prefetched slots if they were fetched for this query, else None."""
+        if self._slots_prefetch is None:
+            return None
+        prefetch_query, task = self._slots_prefetch
+        self._slots_prefetch = None
+
+        if prefetch_query != query:
+            task.cancel()
+            return None
+        try:
+            return await task
+        except Exception as e:
+            logger.warning(f"Slot prefetch failed, fetching again: {e}")
+            return None
+
+    def _discard_slots_prefetch(self):
+        """Cancel an unused slot prefetch."""
+        if self._slots_prefetch is not None:
+            self._slots_prefetch[1].cancel()
+            self._slots_prefetch = None
+
+    # ==================== SHARED FUNCTIONALITY ====================
+
+    def _response_cache_key(self, current_time: Optional[datetime] = None) -> Optional[str]:
+        """
+        Get the response cache key for the current turn.
+        Returns None when the turn isn't cacheable (booking flow, tool calls).
+
+        Args:
+            current_time: Clinic-local time of the turn (defaults to now)
+        """
+        if self.state not in CACHEABLE_STATES:
+            return None
+
+        # Assistant turns are part of the key: the same reply to a different question is a different turn
+        turns = []
+        for msg in self.messages:
+            role = msg.get("role")
+            if role not in ("user", "assistant") or msg.get("tool_calls"):
+                return None
+            turns.append((role, msg.get("content") or ""))
+
+        # Replies can depend on the date and time sent with the turn ("are you open now?",
+        # "tomorrow"), so entries are scoped to the clinic-local hour
+        current_time = current_time or datetime.now(_CLINIC_TZ)
+        time_bucket = current_time.strftime("%Y-%m-%d %H")
+        return self.response_cache.make_key(self.language, self.state.value, time_bucket, turns)
+
+    def _scan_keywords(self, text: str) -> Optional[str]:
+        """
+        Scan normalized caller text for emergency keywords and transfer requests.
+
+        Returns:
+            EMERGENCY, TRANSFER, or None (an emergency outranks a transfer request)
+        """
+        matcher = self._KEYWORD_MATCHERS.get(self.language, self._KEYWORD_MATCHERS["en"])
+        return matcher.scan(text)
 
     def _get_error_response(self) -> str:
         """Get error response in the appropriate language - warm and apologetic."""
-        if self.language == "fr":
-            return "Oups, pardon! J'ai manqué ça. Pouvez-vous me répéter s'il vous plaît?"
-        else:
-            return "Oops, sorry about that! I missed that. Could you say that again for me?"
+        return self.ERROR_RESPONSES.get(self.language, self.ERROR_RESPONSES["en"])
 
     def _get_filler_phrase(self) -> str:
         """Get a natural filler phrase to mask latency during tool calls."""
-        import random
-
-        # More natural, conversational fillers that sound human
-        fillers_fr = [
-            "Parfait, je regarde ça pour vous.",
-            "Super, laissez-moi vérifier nos disponibilités.",
-            "Excellent, je consulte notre calendrier.",
-            "Bien sûr, je vérifie ça tout de suite.",
-            "D'accord, je regarde ce qu'on a de disponible.",
-        ]
+        return random.choice(self.FILLER_PHRASES.get(self.language, self.FILLER_PHRASES["en"]))
 
-        fillers_en = [
-            "Perfect, let me check that for you.",
-            "Great, let me look at our availability.",
-            "Absolutely, I'll check our calendar.",
-            "Sure thing, let me see what we have.",
-            "Of course, I'm checking our schedule now.",
-        ]
+    @classmethod
+    def is_filler_phrase(cls, text: str) -> bool:
+        """Whether text is one of the canned filler phrases (pre-rendered TTS audio)."""
+        return text in cls._FILLER_PHRASE_SET
 
-        if self.language == "fr":
-            return random.choice(fillers_fr)
-        else:
-            return random.choice(fillers_en)
+    @classmethod
+    def fixed_phrases(cls) -> Dict[str, List[str]]:
+        """Greeting and filler phrases per TTS language code, for pre-rendering."""
+        return {
+            tts_language: [SystemPrompts.get_greeting(language), *cls.FILLER_PHRASES[language]]
+            for language, tts_language in (("fr", "fr-CA"), ("en", "en-CA"))
+        }
 
     def get_call_status(self) -> str:
         """
@@ -781,38 +1316,37 @@ class ConversationManager:
         """
         logger.info(f"Handling tool call: {tool_name}")
 
-        if tool_name == "get_available_slots":
-            return await self._handle_get_slots(arguments)
-
-        elif tool_name == "book_appointment":
-            return await self._handle_book_appointment(arguments)
-
-        elif tool_name == "transfer_to_human":
-            self.state = ConversationState.TRANSFERRING
-            return SystemPrompts.get_transfer_message(self.language)
-
-        elif tool_name == "cancel_appointment":
-            return await self._handle_cancel_appointment(arguments)
-
-        else:
+        handler_name = self._TOOL_HANDLERS.get(tool_name)
+        if handler_name is None:
             logger.warning(f"Unknown tool: {tool_name}")
             return self._get_error_response()
 
+        return await getattr(self, handler_name)(arguments)
+
+    async def _handle_transfer(self, arguments: Dict) -> str:
+        """Handle transfer_to_human tool call."""
+        self.state = ConversationState.TRANSFERRING
+        return SystemPrompts.get_transfer_message(self.language)
+
     async def _handle_get_slots(self, arguments: Dict) -> str:
         """Handle get_available_slots tool call."""
-        visit_type = arguments.get("visit_type", "general")
-        preferred_date = arguments.get("preferred_date")
-        days_to_search = arguments.get("days_to_search", 7)
-
-        # Get slots from booking service (n8n or mock)
-        slots = await self.booking_service.get_available_slots(
-            visit_type=visit_type,
-            preferred_date=preferred_date,
-            days_to_search=days_to_search,
-            language=self.language
-        )
+        query = self._slot_query(arguments)
+        visit_type, preferred_date, days_to_search = query
+
+        # Reuse the lookup started while the arguments streamed, if it matches
+        slots = await self._take_prefetched_slots(query)
+
+        if slots is None:
+            # Get slots from booking service (n8n or mock)
+            slots = await self.booking_service.get_available_slots(
+                visit_type=visit_type,
+                preferred_date=preferred_date,
+                days_to_search=days_to_search,
+                language=self.language
+            )
 
         self.available_slots = slots
+        self._slots_by_id = {slot.get("slot_id"): slot for slot in slots}
         self.slots["visit_type"] = visit_type
         self.state = ConversationState.SHOWING_SLOTS
 
@@ -833,21 +1367,16 @@ class ConversationManager:
         # Basic RAMQ Validation (Client-side check)
         # RAMQ format: 4 letters + 8 digits (e.g. BADA 1234 5678)
         if ramq_number:
-            import re
             # Remove spaces and hyphens
-            clean_ramq = re.sub(r'[\s-]', '', ramq_number).upper()
-            if not re.match(r'^[A-Z]{4}\d{8}$', clean_ramq):
+            clean_ramq = _RAMQ_SEPARATORS.sub('', ramq_number).upper()
+            if not _RAMQ_FORMAT.match(clean_ramq):
                  logger.warning(f"Invalid RAMQ format: {ramq_number}")
 
         # Get formatted datetime from available slots
-        formatted_datetime = ""
-        if self.available_slots:
-            for slot in self.available_slots:
-                if slot.get("slot_id") == slot_id:
-                    formatted_datetime = slot.get("formatted_datetime", "")
-                    break
-            if not formatted_datetime and self.available_slots:
-                formatted_datetime = self.available_slots[0].get("formatted_datetime", "")
+        slot = self._slots_by_id.get(slot_id)
+        formatted_datetime = slot.get("formatted_datetime", "") if slot else ""
+        if not formatted_datetime and self.available_slots:
+            formatted_datetime = self.available_slots[0].get("formatted_datetime", "")
 
         # Book via booking service (n8n or mock)
         booking = await self.booking_service.book_appointment(
@@ -875,20 +1404,19 @@ class ConversationManager:
             self.state = ConversationState.ENDING
 
             try:
-                from services.notification import get_notification_service
                 notification_service = get_notification_service()
 
                 # Use formatted datetime if available
                 appt_time_str = formatted_datetime or slot_id
 
                 # Run in background to not block response
-                asyncio.create_task(notification_service.send_booking_confirmation(
+                asyncio.create_task(self._run_outbound(notification_service.send_booking_confirmation(
                     patient_phone=patient_phone,
                     patient_name=patient_name,
                     appointment_time=appt_time_str,
                     confirmation_code=booking.get('confirmation_number', ''),
                     language=self.language
-                ))
+                )))
                 logger.info(f"SMS confirmation queued for {patient_phone}")
             except Exception as e:
                 logger.error(f"Failed to queue SMS confirmation: {e}")
@@ -911,15 +1439,26 @@ class ConversationManager:
         )
 
         if result.get("success"):
-            if self.language == "fr":
-                return f"Votre rendez-vous {confirmation_number} a été annulé. Y a-t-il autre chose que je peux faire pour vous?"
-            else:
-                return f"Your appointment {confirmation_number} has been cancelled. Is there anything else I can help you with?"
-        else:
-            if self.language == "fr":
-                return "Je n'ai pas pu trouver ce rendez-vous. Pouvez-vous vérifier le numéro de confirmation?"
-            else:
-                return "I couldn't find that appointment. Could you please verify the confirmation number?"
+            template = self.CANCEL_SUCCESS.get(self.language, self.CANCEL_SUCCESS["en"])
+            return template.format(confirmation_number=confirmation_number)
+        return self.CANCEL_NOT_FOUND.get(self.language, self.CANCEL_NOT_FOUND["en"])
+
+    async def _run_outbound(self, coro: Awaitable[Any]) -> Any:
+        """Await a background outbound coroutine under the process-wide cap."""
+        async with self._OUTBOUND_SEM:
+            return await coro
+
+    def _record_usage(self, usage: Optional[Dict[str, int]]):
+        """Add one LLM request's token usage to the call totals."""
+        if not usage:
+            return
+        self.total_input_tokens += usage.get("input_tokens", 0)
+        self.total_output_tokens += usage.get("output_tokens", 0)
+        self.total_cached_input_tokens += usage.get("cached_input_tokens", 0)
+
+    def _elapsed_seconds(self) -> int:
+        """Whole seconds since the call started (monotonic clock)."""
+        return int(time.monotonic() - self._start_monotonic)
 
     def _create_call_record(self):
         """Create initial call record in Firestore."""
@@ -933,44 +1472,33 @@ class ConversationManager:
                 "mode": self.mode.value  # Track conversation mode
             }
             # Run async in sync context
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.firebase.create_call(call_data))
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(self.firebase.create_call(call_data))
             else:
-                loop.run_until_complete(self.firebase.create_call(call_data))
+                loop.create_task(self._run_outbound(self.firebase.create_call(call_data)))
             logger.info(f"Call record created: {self.call_sid}")
         except Exception as e:
             logger.error(f"Error creating call record: {e}")
 
     async def save_transcript(self):
         """Save the conversation transcript to Firestore."""
+        await self._drain_transcript_entries()
+
         try:
             # Calculate duration
             end_time = datetime.utcnow()
-            duration_seconds = int((end_time - self.start_time).total_seconds())
+            duration_seconds = self._elapsed_seconds()
 
             # Determine call status
             call_status = self.get_call_status()
 
-            # Calculate Costs
-            from services.cost_tracker import CostService
-
             # Estimate tokens from conversation history (streaming doesn't return usage)
             if self.total_input_tokens < 50 or self.total_output_tokens < 50:
-                input_chars = 0
-                output_chars = 0
-
-                for msg in self.messages:
-                    content = msg.get("content", "")
-                    if isinstance(content, str):
-                        if msg.get("role") in ["user", "system"]:
-                            input_chars += len(content)
-                        elif msg.get("role") == "assistant":
-                            output_chars += len(content)
-
                 # Estimate: ~4 chars per token
-                self.total_input_tokens = max(self.total_input_tokens, int(input_chars / 4))
-                self.total_output_tokens = max(self.total_output_tokens, int(output_chars / 4))
+                self.total_input_tokens = max(self.total_input_tokens, self._input_chars // 4)
+                self.total_output_tokens = max(self.total_output_tokens, self._output_chars // 4)
 
                 logger.info(f"Token estimation: input={self.total_input_tokens}, output={self.total_output_tokens}")
 
@@ -982,8 +1510,7 @@ class ConversationManager:
                 model_name=self.settings.openrouter_model_primary
             )
 
-            # Update call record
-            await self.firebase.end_call(self.call_sid, {
+            summary = {
                 "status": call_status,
                 "duration_seconds": duration_seconds,
                 "booking_made": self.booking_made,
@@ -997,17 +1524,18 @@ class ConversationManager:
                 "usage_metrics": {
                     "tts_chars": self.total_tts_chars,
                     "input_tokens": self.total_input_tokens,
+                    "cached_input_tokens": self.total_cached_input_tokens,
                     "output_tokens": self.total_output_tokens
                 }
-            })
+            }
 
-            # Save transcript
-            await self.firebase.save_transcript(self.call_sid, self.transcript)
+            # Call record + transcript are written in the background so teardown doesn't wait on Firestore
+            await self.transcript_writer.enqueue(self.call_sid, summary, self.get_transcript())
 
-            logger.info(f"Transcript saved for call {self.call_sid}, status: {call_status}, cost: ${cost_data['total_cost']}")
+            logger.info(f"Transcript queued for call {self.call_sid}, status: {call_status}, cost: ${cost_data['total_cost']}")
         except Exception as e:
             logger.error(f"Error saving transcript: {e}")
 
     def get_transcript(self) -> List[Dict[str, Any]]:
-        """Get the conversation transcript."""
-        return self.transcript
+        """Get the conversation transcript with ISO timestamps."""
+        return [_storage_entry(entry) for entry in self.transcript]
@@ -0,0 +1,90 @@
+"""
+MedVoice AI - Response Cache
+In-memory LRU cache for repeated FAQ-style LLM turns.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_PUNCT_RE = re.compile(r"[^\w\s']+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_utterance(text: str) -> str:
+    """Normalize caller text for cache keys (case, punctuation, spacing)."""
+    text = _PUNCT_RE.sub(" ", text.lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+class ResponseCache:
+    """
+    Exact-match response cache shared across calls.
+
+    Keys cover the language, conversation state, clinic-local hour and every
+    caller and assistant turn so far, so a hit only happens when a caller
+    said exactly the same things in reply to the same prompts (e.g. "what
+    are your hours?" right after the greeting) within the same hour. A bare
+    "oui" to two different questions never shares an entry, and answers that
+    depend on the date or time ("are you open now?") don't outlive it.
+    Entries also expire after ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(language: str, state: str, time_bucket: str, turns: Iterable[Tuple[str, str]]) -> str:
+        """Build a cache key from the language, state, time bucket and (role, text) turns."""
+        parts = [language, state, time_bucket]
+        parts.extend(f"{role}:{normalize_utterance(text)}" for role, text in turns)
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"Response cache hit ({self.hits} hits / {self.misses} misses)")
+        return response
+
+    def set(self, key: str, response: str):
+        """Store a response, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Singleton instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the response cache singleton."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -6,11 +6,60 @@ Uses existing Firebase/GCP credentials.
 
 import asyncio
 import logging
-from typing import Optional
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
 from google.cloud import texttospeech
 
 logger = logging.getLogger(__name__)
 
+# Dedicated threads for blocking synthesize_speech calls, so TTS doesn't queue
+# behind Firestore work in the default executor
+_TTS_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tts")
+
+# Markdown list markers at the start of a line
+_LIST_DASH_RE = re.compile(r'^\s*-\s+', re.MULTILINE)
+
+# Markdown emphasis markers (* and **) are dropped in one translate pass
+_STRIP_EMPHASIS = str.maketrans("", "", "*")
+
+# Abbreviations spelled out for speech, one alternation per language
+_ABBREVIATIONS = {
+    "fr": {"e.g.": "par exemple", "c.-à-d.": "c'est-à-dire"},
+    "en": {"e.g.": "for example", "i.e.": "that is"},
+}
+_ABBREVIATION_RES = {
+    lang: re.compile("|".join(map(re.escape, abbreviations)))
+    for lang, abbreviations in _ABBREVIATIONS.items()
+}
+
+# SSML prosody values for Google Cloud TTS: rate names -> percentages,
+# pitch names -> semitones
+_RATE_MAP = {
+    "x-slow": "50%",
+    "slow": "75%",
+    "medium": "100%",
+    "fast": "125%",
+    "x-fast": "150%"
+}
+_PITCH_MAP = {
+    "x-low": "-4st",
+    "low": "-2st",
+    "medium": "0st",
+    "high": "+2st",
+    "x-high": "+4st"
+}
+
+# Output format never varies: mulaw 8kHz for Twilio
+_AUDIO_CONFIG = texttospeech.AudioConfig(
+    audio_encoding=texttospeech.AudioEncoding.MULAW,
+    sample_rate_hertz=8000
+)
+
 
 class GoogleTTSClient:
     """
@@ -43,6 +92,29 @@ class GoogleTTSClient:
         }
     }
 
+    # Pre-rendered audio for fixed phrases (greeting, fillers), shared by every call:
+    # (language, voice gender, text) -> mulaw bytes, primary (Journey) voice only
+    _phrase_audio: Dict[Tuple[str, str, str], bytes] = {}
+
+    # LRU of recently synthesized audio, shared by every call:
+    # (language, voice name, text) -> mulaw bytes (SSML entries use "ssml:<markup>" as the text)
+    AUDIO_CACHE_MAX = 512
+    _audio_cache: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+    _audio_cache_hits = 0
+
+    # Voice selection messages per (language, voice name), built once
+    _voice_params: Dict[Tuple[str, str], "texttospeech.VoiceSelectionParams"] = {}
+
+    # After a Journey failure, go straight to Neural2 for this long (per language)
+    JOURNEY_RETRY_SECONDS = 300
+    _journey_failed_at: Dict[str, float] = {}
+
+    # gRPC clients shared by every call (channel + auth set up once), used round-robin
+    # so concurrent requests from different calls spread over several connections
+    CLIENT_POOL_SIZE = 4
+    _client_pool: List["texttospeech.TextToSpeechClient"] = []
+    _client_index = 0
+
     def __init__(self, voice_gender: str = "female"):
         """
         Initialize Google Cloud TTS client.
@@ -52,7 +124,28 @@ class GoogleTTSClient:
             voice_gender: 'female' or 'male'
         """
         self.voice_gender = voice_gender
-        self.client = texttospeech.TextToSpeechClient()
+        # Characters sent to synthesize_speech by this client (billed; cache hits excluded)
+        self.synthesized_chars = 0
+        if not self._client_pool:
+            # Normally filled at startup (fill_client_pool); one client keeps us working if not
+            self._client_pool.append(texttospeech.TextToSpeechClient())
+
+    @classmethod
+    def fill_client_pool(cls):
+        """
+        Create the pooled TTS clients up front (blocking: channel setup and auth).
+        Run once at startup, off the event loop, so live calls never build a client.
+        """
+        while len(cls._client_pool) < cls.CLIENT_POOL_SIZE:
+            cls._client_pool.append(texttospeech.TextToSpeechClient())
+        logger.info(f"🔊 TTS client pool ready ({len(cls._client_pool)} clients)")
+
+    @property
+    def client(self) -> "texttospeech.TextToSpeechClient":
+        """Next pooled TTS client (round-robin)."""
+        pool = self._client_pool
+        GoogleTTSClient._client_index = (GoogleTTSClient._client_index + 1) % len(pool)
+        return pool[GoogleTTSClient._client_index]
 
     async def synthesize(self, text: str, language: str = "fr-CA") -> Optional[bytes]:
         """
@@ -65,59 +158,113 @@ class GoogleTTSClient:
         Returns:
             Audio bytes in mulaw format, or None on error
         """
-        if not text:
-            return None
+        audio, _ = await self._synthesize_text(text, language)
+        return audio
+
+    async def _synthesize_text(self, text: str, language: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Synthesize text to speech, reporting the voice that rendered it.
+
+        Returns:
+            (audio bytes in mulaw format, voice name), or (None, None) on error
+        """
+        if not text or text.isspace():
+            return None, None
 
         # Normalize text (remove markdown, expand abbrevs)
         text = self._normalize_text(text, language)
+        if not text.strip():
+            return None, None
 
         # Normalize language codes - map en-CA to en-US (we don't have en-CA voices)
         normalized_language = self._normalize_language(language)
 
         # Try Journey voices first, fall back to Neural2 if needed
-        for use_fallback in [False, True]:
+        # (skip Journey while it is known to be failing for this language)
+        failed_at = self._journey_failed_at.get(normalized_language)
+        journey_down = failed_at is not None and time.monotonic() - failed_at < self.JOURNEY_RETRY_SECONDS
+        for use_fallback in ([True] if journey_down else [False, True]):
+            voice_name = self._get_voice(normalized_language, use_fallback=use_fallback)
+
+            # Repeated prompts (slot listings, confirmations, error prompts) skip the round-trip;
+            # keyed by voice so fallback audio is never served once Journey is back
+            cache_key = (normalized_language, voice_name, text)
+            cached = self._get_cached_audio(cache_key)
+            if cached is not None:
+                return cached, voice_name
+
             try:
-                voice_name = self._get_voice(normalized_language, use_fallback=use_fallback)
                 logger.info(f"🔊 TTS using voice: {voice_name} (language: {normalized_language})")
 
                 # Set up the synthesis input
                 synthesis_input = texttospeech.SynthesisInput(text=text)
-
-                # Build the voice request
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code=normalized_language,
-                    name=voice_name
-                )
-
-                # Select the audio encoding - mulaw 8kHz for Twilio
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MULAW,
-                    sample_rate_hertz=8000
-                )
+                voice = self._get_voice_params(normalized_language, voice_name)
 
                 # Run synthesis in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.synthesize_speech(
+                response = await asyncio.get_running_loop().run_in_executor(
+                    _TTS_EXECUTOR,
+                    partial(
+                        self.client.synthesize_speech,
                         input=synthesis_input,
                         voice=voice,
-                        audio_config=audio_config
+                        audio_config=_AUDIO_CONFIG
                     )
                 )
 
                 logger.info(f"🔊 TTS synthesis completed for: {text[:50]}...")
-                return response.audio_content
+                self.synthesized_chars += len(text)
+                if not use_fallback:
+                    self._journey_failed_at.pop(normalized_language, None)
+                self._cache_audio(cache_key, response.audio_content)
+                return response.audio_content, voice_name
 
             except Exception as e:
                 if use_fallback:
                     logger.error(f"❌ TTS synthesis error (fallback failed): {e}")
-                    return None
+                    return None, None
                 else:
                     logger.warning(f"⚠️ Journey voice failed, trying fallback: {e}")
+                    self._journey_failed_at[normalized_language] = time.monotonic()
                     continue
 
-        return None
+        return None, None
+
+    async def synthesize_cached(self, text: str, language: str = "fr-CA") -> Optional[bytes]:
+        """
+        Synthesize a fixed phrase, reusing audio rendered earlier in the process.
+        Only use for a bounded set of phrases (greeting, fillers) - entries never expire.
+        Fallback-voice renders are not pinned, so the phrase is retried in the
+        primary voice on the next use.
+
+        Args:
+            text: Phrase to synthesize
+            language: Language code ('fr-CA' or 'en-CA')
+
+        Returns:
+            Audio bytes in mulaw format, or None on error
+        """
+        normalized_language = self._normalize_language(language)
+        key = (normalized_language, self.voice_gender, text)
+        audio = self._phrase_audio.get(key)
+        if audio is None:
+            audio, voice_name = await self._synthesize_text(text, language)
+            if audio and voice_name == self._get_voice(normalized_language):
+                self._phrase_audio[key] = audio
+        return audio
+
+    async def prerender(self, phrases: Dict[str, Iterable[str]]):
+        """
+        Render fixed phrases ahead of the first call (startup warm-up).
+
+        Args:
+            phrases: Language code -> phrases to render
+        """
+        rendered = 0
+        for language, texts in phrases.items():
+            for text in texts:
+                if await self.synthesize_cached(text, language):
+                    rendered += 1
+        logger.info(f"🔊 Pre-rendered {rendered} fixed TTS phrases")
 
     def _normalize_text(self, text: str, language: str) -> str:
         """
@@ -126,23 +273,16 @@ class GoogleTTSClient:
         - Remove list markers (- )
         - Expand common abbreviations
         """
-        import re
-        
         # Remove bold/italic markers
-        text = text.replace("**", "").replace("*", "")
-        
+        text = text.translate(_STRIP_EMPHASIS)
+
         # Remove list dashes at start of lines
-        text = re.sub(r'^\s*-\s+', '', text, flags=re.MULTILINE)
-        
-        # Expand abbreviations based on language
-        if "fr" in language:
-            text = text.replace("e.g.", "par exemple")
-            text = text.replace("c.-à-d.", "c'est-à-dire")
-        else:
-            text = text.replace("e.g.", "for example")
-            text = text.replace("i.e.", "that is")
-            
-        return text
+        text = _LIST_DASH_RE.sub('', text)
+
+        # Expand abbreviations based on language (single pass)
+        lang = "fr" if "fr" in language else "en"
+        abbreviations = _ABBREVIATIONS[lang]
+        return _ABBREVIATION_RES[lang].sub(lambda m: abbreviations[m.group()], text)
 
     async def synthesize_ssml(self, ssml: str, language: str = "fr-CA") -> Optional[bytes]:
         """
@@ -159,39 +299,55 @@ class GoogleTTSClient:
         try:
             # Normalize language codes
             normalized_language = self._normalize_language(language)
+
             voice_name = self._get_voice(normalized_language)
 
+            cache_key = (normalized_language, voice_name, f"ssml:{ssml}")
+            cached = self._get_cached_audio(cache_key)
+            if cached is not None:
+                return cached
+
             # Set up the synthesis input with SSML
             synthesis_input = texttospeech.SynthesisInput(ssml=ssml)
+            voice = self._get_voice_params(normalized_language, voice_name)
 
-            # Build the voice request
-            voice = texttospeech.VoiceSelectionParams(
-                language_code=normalized_language,
-                name=voice_name
-            )
-
-            # Select the audio encoding - mulaw 8kHz for Twilio
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MULAW,
-                sample_rate_hertz=8000
-            )
-
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.synthesize_speech(
+            response = await asyncio.get_running_loop().run_in_executor(
+                _TTS_EXECUTOR,
+                partial(
+                    self.client.synthesize_speech,
                     input=synthesis_input,
                     voice=voice,
-                    audio_config=audio_config
+                    audio_config=_AUDIO_CONFIG
                 )
             )
 
+            self.synthesized_chars += len(ssml)
+            self._cache_audio(cache_key, response.audio_content)
             return response.audio_content
 
         except Exception as e:
             logger.error(f"SSML synthesis error: {e}")
             return None
 
+    def _get_cached_audio(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        """Get recently synthesized audio from the shared LRU (None on miss)."""
+        audio = self._audio_cache.get(key)
+        if audio is None:
+            return None
+        self._audio_cache.move_to_end(key)
+        GoogleTTSClient._audio_cache_hits += 1
+        logger.debug(f"🔊 TTS cache hit ({GoogleTTSClient._audio_cache_hits} total)")
+        return audio
+
+    def _cache_audio(self, key: Tuple[str, str, str], audio: Optional[bytes]):
+        """Store synthesized audio, evicting the least recently used entries."""
+        if not audio:
+            return
+        self._audio_cache[key] = audio
+        self._audio_cache.move_to_end(key)
+        while len(self._audio_cache) > self.AUDIO_CACHE_MAX:
+            self._audio_cache.popitem(last=False)
+
     def _normalize_language(self, language: str) -> str:
         """
         Normalize language codes to supported TTS languages.
@@ -205,6 +361,15 @@ class GoogleTTSClient:
         }
         return language_map.get(language, language)
 
+    def _get_voice_params(self, language: str, voice_name: str) -> "texttospeech.VoiceSelectionParams":
+        """Get the (shared) voice selection message for a language and voice."""
+        key = (language, voice_name)
+        params = self._voice_params.get(key)
+        if params is None:
+            params = texttospeech.VoiceSelectionParams(language_code=language, name=voice_name)
+            self._voice_params[key] = params
+        return params
+
     def _get_voice(self, language: str, use_fallback: bool = False) -> str:
         """Get the appropriate voice name for the language and gender."""
         voices = self.FALLBACK_VOICES if use_fallback else self.VOICES
@@ -230,35 +395,11 @@ class GoogleTTSClient:
         Returns:
             SSML string
         """
-        # Map rate names to percentages for Google Cloud TTS
-        rate_map = {
-            "x-slow": "50%",
-            "slow": "75%",
-            "medium": "100%",
-            "fast": "125%",
-            "x-fast": "150%"
-        }
-
-        # Map pitch names to semitones
-        pitch_map = {
-            "x-low": "-4st",
-            "low": "-2st",
-            "medium": "0st",
-            "high": "+2st",
-            "x-high": "+4st"
-        }
-
-        rate_value = rate_map.get(rate, "100%")
-        pitch_value = pitch_map.get(pitch, "0st")
+        rate_value = _RATE_MAP.get(rate, "100%")
+        pitch_value = _PITCH_MAP.get(pitch, "0st")
 
-        ssml = f"""
-<speak>
-    <prosody rate="{rate_value}" pitch="{pitch_value}">
-        {text}
-    </prosody>
-</speak>
-"""
-        return ssml.strip()
+        # Escape the text so &, < and > can't break the markup
+        return f'<speak><prosody rate="{rate_value}" pitch="{pitch_value}">{escape(text)}</prosody></speak>'
 
 
 # Alias for backwards compatibility
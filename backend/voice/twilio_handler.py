@@ -13,7 +13,8 @@ from fastapi import WebSocket
 from .asr_client import DeepgramASRClient
 from .tts_client import GoogleTTSClient
 from .audio_utils import AudioConverter
-from .conversation import ConversationManager
+from .conversation import ConversationManager, ConversationMode
+from llm.client import has_idle_connection
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,9 @@ class TwilioMediaStreamHandler:
     Orchestrates ASR, LLM, and TTS for voice conversations.
     """
 
+    # Sentence delimiters for chunking streamed responses
+    SENTENCE_DELIMITERS = frozenset(".!?,")
+
     def __init__(self, websocket: WebSocket, settings):
         self.websocket = websocket
         self.settings = settings
@@ -46,6 +50,11 @@ class TwilioMediaStreamHandler:
         self.is_generating_response = False  # Guard against double responses
         self.audio_queue: asyncio.Queue = asyncio.Queue()
         self.should_stop = False
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+        # Outbound frames pre-serialized once the stream SID is known
+        self._media_prefix: Optional[str] = None
+        self._mark_message: Optional[str] = None
 
         # Media buffer synchronization lock
         self._media_lock = asyncio.Lock()
@@ -53,10 +62,10 @@ class TwilioMediaStreamHandler:
 
     async def handle_stream(self):
         """Main loop to handle incoming WebSocket messages from Twilio."""
-        try:
-            # Start audio sender task
-            sender_task = asyncio.create_task(self._audio_sender())
+        # Start audio sender task (it blocks on the queue until cancelled)
+        sender_task = asyncio.create_task(self._audio_sender())
 
+        try:
             async for message in self.websocket.iter_text():
                 if self.should_stop:
                     break
@@ -80,11 +89,11 @@ class TwilioMediaStreamHandler:
                     await self._handle_stop(data)
                     break
 
-            sender_task.cancel()
-
         except Exception as e:
             logger.error(f"Stream handler error: {e}")
             raise
+        finally:
+            sender_task.cancel()
 
     async def _handle_connected(self, data: dict):
         """Handle stream connected event."""
@@ -97,6 +106,18 @@ class TwilioMediaStreamHandler:
         self.stream_sid = start_data.get("streamSid")
         self.call_sid = start_data.get("callSid")
 
+        # Base64 payloads need no JSON escaping, so media frames are built by concatenation
+        self._media_prefix = (
+            '{"event":"media","streamSid":' + json.dumps(self.stream_sid) + ',"media":{"payload":"'
+        )
+        self._mark_message = json.dumps({
+            "event": "mark",
+            "streamSid": self.stream_sid,
+            "mark": {
+                "name": "audio_end"
+            }
+        })
+
         # Get custom parameters - log everything for debugging
         custom_params = start_data.get("customParameters", {})
         logger.info(f"📋 Custom parameters received: {custom_params}")
@@ -131,6 +152,11 @@ class TwilioMediaStreamHandler:
         # Send greeting in background
         asyncio.create_task(self._send_greeting())
 
+        # Open the LLM connection while the greeting plays (pooled connections
+        # expire after 60s idle, so most calls would otherwise start cold)
+        if self.conversation.mode == ConversationMode.TURN_BASED:
+            self._prewarm_task = asyncio.create_task(self._prewarm_llm())
+
     async def _connect_asr_and_flush(self):
         """Connect to ASR and flush buffered media."""
         if not self.asr_client:
@@ -141,12 +167,15 @@ class TwilioMediaStreamHandler:
             # Use lock to atomically flush buffer and set ready flag
             async with self._media_lock:
                 logger.info(f"🚀 ASR Connected. Flushing {len(self.media_buffer)} buffered packets.")
+                # Decode the backlog and send it as one frame instead of one per packet
+                buffered_audio = []
                 for payload in self.media_buffer:
                     try:
-                        audio_data = base64.b64decode(payload)
-                        await self.asr_client.send_audio(audio_data)
+                        buffered_audio.append(base64.b64decode(payload))
                     except Exception as e:
                         logger.error(f"Error flushing audio: {e}")
+                if buffered_audio:
+                    await self.asr_client.send_audio(b"".join(buffered_audio))
                 self.media_buffer = []
                 # Only set ready AFTER buffer is fully flushed
                 self._asr_ready = True
@@ -162,21 +191,32 @@ class TwilioMediaStreamHandler:
         if not payload:
             return
 
-        # Use lock to ensure atomic check-and-send/buffer
+        # Steady state: the flag only flips once, after the buffer is flushed
+        if self._asr_ready:
+            await self._send_media(payload)
+            return
+
+        # Use lock to ensure atomic check-and-send/buffer while the flush may be running
         async with self._media_lock:
             # Only send directly if ASR is fully ready (connected AND buffer flushed)
-            if self._asr_ready and self.asr_client:
-                try:
-                    audio_data = base64.b64decode(payload)
-                    await self.asr_client.send_audio(audio_data)
-                except Exception as e:
-                    logger.error(f"Error processing audio: {e}")
+            if self._asr_ready:
+                await self._send_media(payload)
             else:
                 # Buffer audio if not yet ready
                 # Limit buffer size to avoid memory issues (e.g., 10 seconds of audio)
                 if len(self.media_buffer) < 500:  # ~10s of 20ms packets
                     self.media_buffer.append(payload)
 
+    async def _send_media(self, payload: str):
+        """Decode a Twilio media payload and forward it to ASR."""
+        if not self.asr_client:
+            return
+        try:
+            audio_data = base64.b64decode(payload)
+            await self.asr_client.send_audio(audio_data)
+        except Exception as e:
+            logger.error(f"Error processing audio: {e}")
+
     async def _handle_mark(self, data: dict):
         """Handle mark event - audio playback acknowledgment."""
         mark_name = data.get("mark", {}).get("name")
@@ -261,21 +301,30 @@ class TwilioMediaStreamHandler:
             await asyncio.sleep(0.2)
 
             greeting = self.conversation.get_greeting()
-            await self._speak(greeting)
+            await self._speak(greeting, cached=True)
+
+    async def _prewarm_llm(self):
+        """Prewarm the LLM connection, unless the shared pool already has one ready."""
+        if has_idle_connection():
+            return
+        await self.conversation.llm_client.prewarm()
 
-    async def _speak(self, text: str):
-        """Convert text to speech and send to Twilio."""
+    async def _speak(self, text: str, cached: bool = False):
+        """Convert text to speech and send to Twilio (cached=True for fixed phrases)."""
         if not text or not self.tts_client:
             return
 
         logger.info(f"🔊 Assistant: {text}")
 
         # Get detected language from conversation
-        language = "fr-CA" if self.conversation and self.conversation.language == "fr" else "en-CA"
+        language = self.conversation.tts_language if self.conversation else "en-CA"
 
         try:
             # Synthesize speech
-            audio_data = await self.tts_client.synthesize(text, language)
+            if cached:
+                audio_data = await self.tts_client.synthesize_cached(text, language)
+            else:
+                audio_data = await self.tts_client.synthesize(text, language)
 
             if audio_data:
                 # Convert to Twilio format (mulaw base64)
@@ -284,9 +333,7 @@ class TwilioMediaStreamHandler:
                 # Queue audio for sending
                 await self.audio_queue.put(mulaw_base64)
 
-                # Track TTS characters for cost calculation
                 if self.conversation:
-                    self.conversation.total_tts_chars += len(text)
                     await self.conversation.add_assistant_message(text)
 
         except Exception as e:
@@ -296,6 +343,7 @@ class TwilioMediaStreamHandler:
         """
         Stream AI response to TTS for minimal latency.
         Buffers tokens until sentence boundary, then speaks each chunk.
+        Chunks are synthesized concurrently and queued for playback in order.
         """
         if not self.conversation:
             return
@@ -305,65 +353,95 @@ class TwilioMediaStreamHandler:
         logger.info("🎯 Starting response generation")
 
         # Get detected language
-        language = "fr-CA" if self.conversation.language == "fr" else "en-CA"
+        language = self.conversation.tts_language
 
-        # Sentence delimiters for chunking
-        sentence_delimiters = ".!?,"
         buffer = ""
         full_response = ""
 
+        # Renders start as soon as a chunk is ready; the forwarder keeps playback order
+        renders: asyncio.Queue = asyncio.Queue()
+        forwarder = asyncio.create_task(self._forward_rendered_chunks(renders))
+
+        def speak_chunk(text: str, cached: bool = False):
+            renders.put_nowait(asyncio.create_task(self._render_chunk(text, language, cached)))
+
         try:
             # Stream tokens from LLM
             async for token in self.conversation.get_response_streaming():
+                # Filler phrases play from pre-rendered audio: flush what's buffered, then the filler
+                if self.conversation.is_filler_phrase(token):
+                    if buffer.strip():
+                        speak_chunk(buffer.strip())
+                    buffer = ""
+                    full_response += token
+                    logger.info(f"🔊 Assistant (filler): {token}")
+                    speak_chunk(token, cached=True)
+                    continue
+
                 buffer += token
                 full_response += token
 
                 # Speak when we hit a sentence boundary and have enough text
-                if any(d in token for d in sentence_delimiters) and len(buffer) > 20:
+                if len(buffer) > 20 and not self.SENTENCE_DELIMITERS.isdisjoint(token):
                     chunk = buffer.strip()
                     if chunk:
                         logger.info(f"🔊 Assistant (chunk): {chunk}")
-                        await self._speak_chunk(chunk, language)
+                        speak_chunk(chunk)
                     buffer = ""
 
             # Speak remaining text
             if buffer.strip():
                 logger.info(f"🔊 Assistant (final): {buffer.strip()}")
-                await self._speak_chunk(buffer.strip(), language)
+                speak_chunk(buffer.strip())
 
-            # Add full response to transcript
+            # One transcript entry per assistant turn (not per chunk)
             if full_response and self.conversation:
                 await self.conversation.add_assistant_message(full_response)
 
         except Exception as e:
             logger.error(f"Streaming TTS error: {e}")
         finally:
+            # Let already-started chunks reach the audio queue
+            renders.put_nowait(None)
+            await forwarder
+
             # Always clear the flag when done
             self.is_generating_response = False
             logger.info("✅ Response generation complete")
             
-    async def _speak_chunk(self, text: str, language: str):
-        """Speak a single chunk of text."""
+    async def _render_chunk(self, text: str, language: str, cached: bool = False) -> Optional[str]:
+        """Synthesize a chunk of text to Twilio audio (mulaw base64) without queueing it."""
         if not text or not self.tts_client:
-            return
+            return None
 
         try:
             # Generate TTS
-            audio_data = await self.tts_client.synthesize(text, language)
+            if cached:
+                audio_data = await self.tts_client.synthesize_cached(text, language)
+            else:
+                audio_data = await self.tts_client.synthesize(text, language)
 
             if audio_data:
-                mulaw_base64 = self.audio_converter.to_twilio_format(audio_data)
-
-                # If valid audio, queue it
-                if mulaw_base64:
-                    await self.audio_queue.put(mulaw_base64)
-
-                    # Track TTS characters for cost calculation
-                    if self.conversation:
-                        self.conversation.total_tts_chars += len(text)
+                return self.audio_converter.to_twilio_format(audio_data)
 
         except Exception as e:
             logger.error(f"TTS chunk error: {e}")
+        return None
+
+    async def _forward_rendered_chunks(self, renders: asyncio.Queue):
+        """
+        Queue rendered chunks for playback in the order they were spoken.
+
+        Args:
+            renders: Render tasks, terminated by None
+        """
+        while True:
+            render = await renders.get()
+            if render is None:
+                return
+            mulaw_base64 = await render
+            if mulaw_base64:
+                await self.audio_queue.put(mulaw_base64)
 
 
 
@@ -375,36 +453,24 @@ class TwilioMediaStreamHandler:
         while not self.should_stop:
             try:
                 # Wait for audio in queue
-                audio_base64 = await asyncio.wait_for(
-                    self.audio_queue.get(),
-                    timeout=0.1
-                )
+                audio_base64 = await self.audio_queue.get()
+
+                # Drain whatever else is already queued so one mark covers the batch
+                batch = [audio_base64]
+                while not self.audio_queue.empty():
+                    batch.append(self.audio_queue.get_nowait())
+                batch = [audio for audio in batch if audio]
 
-                if audio_base64 and self.stream_sid:
+                if batch and self.stream_sid:
                     self.is_playing_audio = True
 
                     # Send audio to Twilio
-                    message = {
-                        "event": "media",
-                        "streamSid": self.stream_sid,
-                        "media": {
-                            "payload": audio_base64
-                        }
-                    }
-                    await self.websocket.send_json(message)
+                    for audio in batch:
+                        await self.websocket.send_text(self._media_prefix + audio + '"}}')
 
                     # Send mark to know when audio finishes
-                    mark_message = {
-                        "event": "mark",
-                        "streamSid": self.stream_sid,
-                        "mark": {
-                            "name": "audio_end"
-                        }
-                    }
-                    await self.websocket.send_json(mark_message)
-
-            except asyncio.TimeoutError:
-                continue
+                    await self.websocket.send_text(self._mark_message)
+
             except Exception as e:
                 if not self.should_stop:
                     logger.error(f"Audio sender error: {e}")
@@ -414,10 +480,16 @@ class TwilioMediaStreamHandler:
         """Clean up resources."""
         self.should_stop = True
 
+        if self._prewarm_task:
+            self._prewarm_task.cancel()
+
         if self.asr_client:
             await self.asr_client.close()
 
         if self.conversation:
+            # Only real synthesis requests are billed (cached and pinned audio is free)
+            if self.tts_client:
+                self.conversation.total_tts_chars += self.tts_client.synthesized_chars
             await self.conversation.save_transcript()
 
         logger.info("🧹 Handler resources cleaned up")